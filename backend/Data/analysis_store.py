@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Resolved once here; every reader and writer of analyses goes through this root
+ANALYSIS_DIR = os.getenv(
+    "ANALYSIS_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Analysis")
+)
+
+
+class AnalysisStore:
+    """
+    Content-addressed, versioned store for generated analyses.
+
+    Every distinct text is written once to ``.objects/<sha[:2]>/<sha>.txt``;
+    a per ticker/type manifest in ``.manifests`` lists the versions in order.
+    The familiar ``{ticker}_{type}_analysis.txt`` (or
+    ``{ticker}_company_story.txt``) head file is a hard link to the latest
+    object, swapped in with an atomic rename, so readers of the head file
+    always see one complete version. Only the last ``max_versions`` versions
+    are kept; ``.refs`` records which ticker/types list each object, so one
+    no longer listed anywhere is deleted without scanning every manifest.
+    """
+
+    def __init__(self, root: str = ANALYSIS_DIR, max_versions: int = None):
+        self.root = root
+        self.max_versions = max_versions or int(os.getenv("ANALYSIS_MAX_VERSIONS", "20"))
+        self._lock = threading.Lock()
+        self._refs_ready = False
+
+    @staticmethod
+    def file_name(ticker: str, analysis_type: str) -> str:
+        if analysis_type == "company_story":
+            return f"{ticker}_company_story.txt"
+        return f"{ticker}_{analysis_type}_analysis.txt"
+
+    def head_path(self, ticker: str, analysis_type: str) -> str:
+        return os.path.join(self.root, self.file_name(ticker, analysis_type))
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, ".objects", digest[:2], f"{digest}.txt")
+
+    def _manifest_path(self, ticker: str, analysis_type: str) -> str:
+        return os.path.join(self.root, ".manifests", f"{ticker}_{analysis_type}.json")
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _link_head(self, object_path: str, head_path: str) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        os.remove(tmp_path)
+        try:
+            os.link(object_path, tmp_path)
+        except OSError:
+            # Filesystems without hard links get a copy instead
+            with open(object_path, "rb") as src, open(tmp_path, "wb") as dst:
+                dst.write(src.read())
+        os.replace(tmp_path, head_path)
+
+    def versions(self, ticker: str, analysis_type: str) -> List[Dict]:
+        """Stored versions, oldest first: ``[{"sha256", "size", "created_at"}, ...]``."""
+        try:
+            with open(self._manifest_path(ticker, analysis_type), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def put(self, ticker: str, analysis_type: str, content: str) -> str:
+        """
+        Store a new version of an analysis and make it the head.
+
+        Identical content is neither written again nor recorded as a new
+        version.
+
+        Returns:
+            str: SHA-256 of the content, which identifies the version
+        """
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(digest)
+        head_path = self.head_path(ticker, analysis_type)
+
+        with self._lock:
+            if not os.path.exists(object_path):
+                self._atomic_write(object_path, data)
+
+            versions = self.versions(ticker, analysis_type)
+            key = self._ref_name(ticker, analysis_type)
+            dropped = []
+            if not versions or versions[-1]["sha256"] != digest:
+                # Reference first, so the object is never listed without one
+                self._add_ref(digest, key)
+                versions.append({"sha256": digest, "size": len(data), "created_at": time.time()})
+                dropped = [entry["sha256"] for entry in versions[:-self.max_versions]]
+                versions = versions[-self.max_versions:]
+                self._atomic_write(
+                    self._manifest_path(ticker, analysis_type), json.dumps(versions).encode("utf-8")
+                )
+
+            if not (os.path.exists(head_path) and os.path.samefile(head_path, object_path)):
+                self._link_head(object_path, head_path)
+
+            for old in set(dropped) - {entry["sha256"] for entry in versions}:
+                self._release(old, key)
+        return digest
+
+    @staticmethod
+    def _ref_name(ticker: str, analysis_type: str) -> str:
+        return f"{ticker}_{analysis_type}"
+
+    def _refs_path(self, digest: str) -> str:
+        return os.path.join(self.root, ".refs", digest[:2], digest)
+
+    def _ensure_refs(self) -> None:
+        """Build the reverse index from the manifests once, for stores written before it existed (caller holds the lock)."""
+        if self._refs_ready:
+            return
+        marker = os.path.join(self.root, ".refs", "INDEXED")
+        if not os.path.exists(marker):
+            manifest_dir = os.path.join(self.root, ".manifests")
+            names = os.listdir(manifest_dir) if os.path.isdir(manifest_dir) else []
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(manifest_dir, name), "r") as f:
+                        entries = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    continue
+                for entry in entries:
+                    self._touch_ref(entry["sha256"], name[:-len(".json")])
+            self._atomic_write(marker, b"")
+        self._refs_ready = True
+
+    def _touch_ref(self, digest: str, key: str) -> None:
+        refs = self._refs_path(digest)
+        os.makedirs(refs, exist_ok=True)
+        open(os.path.join(refs, key), "a").close()
+
+    def _add_ref(self, digest: str, key: str) -> None:
+        self._ensure_refs()
+        self._touch_ref(digest, key)
+
+    def _release(self, digest: str, key: str) -> None:
+        """
+        Drop ``key``'s reference to an object and delete the object once nothing refers to it.
+
+        Each object has a ``.refs/<sha[:2]>/<sha>/`` folder with one marker per
+        ticker/type whose manifest lists it (identical texts share an object),
+        so this costs a few file operations however many analyses are stored.
+        """
+        self._ensure_refs()
+        refs = self._refs_path(digest)
+        try:
+            os.remove(os.path.join(refs, key))
+        except FileNotFoundError:
+            pass
+        try:
+            os.rmdir(refs)
+        except OSError:
+            return  # Still listed by another manifest
+        object_path = self._object_path(digest)
+        try:
+            # Heads are hard links, so a linked object has more than one name
+            if os.stat(object_path).st_nlink == 1:
+                os.remove(object_path)
+        except FileNotFoundError:
+            pass
+
+    def get(self, ticker: str, analysis_type: str, version: Optional[str] = None) -> Optional[str]:
+        """
+        Read the head of an analysis, or a specific version by its SHA-256.
+
+        Returns:
+            Optional[str]: Content, or None if there is no such analysis/version
+        """
+        path = self.head_path(ticker, analysis_type) if version is None else self._object_path(version)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+# Shared store over backend/Analysis (or $ANALYSIS_DIR)
+analysis_store = AnalysisStore()
@@ -0,0 +1,165 @@
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from Data.price_store import PriceStore, COMPANY_DATA_DIR
+    from Data.providers import YFinanceProvider, FixtureProvider
+    from Data.web_extract import ingest_ticker
+except ImportError:
+    # Running as a script from inside Data/
+    from price_store import PriceStore, COMPANY_DATA_DIR
+    from providers import YFinanceProvider, FixtureProvider
+    from web_extract import ingest_ticker
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at most ``rate`` per second across all workers."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _ThrottledTicker:
+    """Proxy that takes a limiter slot before every provider access (history(), statements, info)."""
+
+    def __init__(self, ticker, limiter):
+        self._ticker = ticker
+        self._limiter = limiter
+
+    def __getattr__(self, name):
+        self._limiter.acquire()
+        return getattr(self._ticker, name)
+
+
+class _ThrottledProvider:
+    def __init__(self, provider, limiter):
+        self._provider = provider
+        self._limiter = limiter
+
+    def ticker(self, symbol):
+        return _ThrottledTicker(self._provider.ticker(symbol), self._limiter)
+
+
+def ingest_symbol(symbol, provider, incremental=False, output_root=COMPANY_DATA_DIR,
+                  retries=3, backoff=1.0):
+    """
+    Ingest one symbol, retrying failures with exponential backoff and jitter.
+
+    Returns:
+        dict: Report entry with symbol, ok, attempts, seconds and error
+    """
+    started = time.monotonic()
+    error = None
+    for attempt in range(1, retries + 2):
+        try:
+            ingest_ticker(symbol, incremental=incremental, provider=provider, output_root=output_root)
+            return {"symbol": symbol, "ok": True, "attempts": attempt,
+                    "seconds": round(time.monotonic() - started, 3), "error": None}
+        except Exception as e:
+            error = str(e)
+            if attempt <= retries:
+                time.sleep(backoff * (2 ** (attempt - 1)) * (0.5 + random.random()))
+
+    return {"symbol": symbol, "ok": False, "attempts": retries + 1,
+            "seconds": round(time.monotonic() - started, 3), "error": error}
+
+
+def ingest_batch(symbols, provider=None, workers=8, requests_per_second=2.0, incremental=False,
+                 output_root=COMPANY_DATA_DIR, retries=3, backoff=1.0):
+    """
+    Ingest many symbols on a bounded worker pool sharing one global rate limit.
+
+    Args:
+        symbols (list): Ticker symbols to ingest
+        provider: Data provider (defaults to YFinanceProvider)
+        workers (int): Size of the worker pool
+        requests_per_second (float): Global cap on provider requests; 0 disables it
+        incremental (bool): Only fetch data newer than what is stored
+        output_root (str): company_data directory to write into
+        retries (int): Retries per symbol after the first attempt
+        backoff (float): Base delay in seconds for the exponential backoff
+
+    Returns:
+        dict: Summary counts plus one report entry per symbol
+    """
+    limiter = RateLimiter(requests_per_second)
+    provider = _ThrottledProvider(provider or YFinanceProvider(), limiter)
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+
+    started = time.monotonic()
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(ingest_symbol, symbol, provider, incremental, output_root, retries, backoff)
+            for symbol in symbols
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            status = "ok" if result["ok"] else f"FAILED ({result['error']})"
+            print(f"{result['symbol']}: {status} after {result['attempts']} attempt(s)")
+            results.append(result)
+
+    results.sort(key=lambda r: r["symbol"])
+    succeeded = sum(1 for r in results if r["ok"])
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "seconds": round(time.monotonic() - started, 3),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest company data for many tickers concurrently")
+    parser.add_argument("symbols", nargs="*", help="Ticker symbols")
+    parser.add_argument("--file", help="File with one ticker symbol per line")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=2.0, help="Global provider requests per second")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--fixtures", help="Read from a local fixture directory instead of yfinance")
+    parser.add_argument("--output", default=COMPANY_DATA_DIR, help="company_data directory to write into")
+    parser.add_argument("--report", help="Write the JSON report to this path")
+    parser.add_argument("--migrate-legacy", action="store_true",
+                        help="Import existing stock_prices.csv files into the price store first")
+    args = parser.parse_args()
+
+    if args.migrate_legacy:
+        migrated = PriceStore(args.output).migrate_legacy_csvs()
+        print(f"Imported legacy price CSVs for {len(migrated)} ticker(s)")
+
+    symbols = list(args.symbols)
+    if args.file:
+        with open(args.file, "r") as f:
+            symbols.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if not symbols:
+        if args.migrate_legacy:
+            raise SystemExit(0)
+        parser.error("No symbols given")
+
+    provider = FixtureProvider(args.fixtures) if args.fixtures else YFinanceProvider()
+    report = ingest_batch(symbols, provider=provider, workers=args.workers,
+                          requests_per_second=args.rps, incremental=args.incremental,
+                          output_root=args.output, retries=args.retries)
+
+    print(f"Ingested {report['succeeded']}/{report['total']} symbols in {report['seconds']}s")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,287 @@
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+COMPANY_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "company_data")
+
+
+class PriceStore:
+    """
+    Columnar OHLCV store backed by memory-mapped NumPy arrays.
+
+    Every ticker gets a ``prices`` folder inside its company_data directory.
+    Each write goes to a fresh ``v<n>`` folder with one ``.npy`` file per
+    column, and ``meta.json`` is then atomically replaced to point at it, so a
+    reader always maps one complete version. Timestamps are kept as UTC
+    nanoseconds, so a date window is found with a binary search and loaded as
+    a slice of the mapped arrays instead of a network call or a CSV parse.
+    """
+
+    INDEX = "Date"
+    COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+    LEGACY_CSV = "stock_prices.csv"
+    # Attempts at mapping a consistent version while writers are pruning old ones
+    READ_ATTEMPTS = 5
+
+    def __init__(self, root: str = COMPANY_DATA_DIR):
+        self.root = root
+        # ticker -> (meta stat key, tz, {column: memmap})
+        self._maps: Dict[str, tuple] = {}
+        # ticker -> (meta stat key, version)
+        self._versions: Dict[str, tuple] = {}
+
+    def _dir(self, ticker: str) -> str:
+        return os.path.join(self.root, ticker, "prices")
+
+    def _meta_path(self, ticker: str) -> str:
+        return os.path.join(self._dir(ticker), "meta.json")
+
+    def _meta(self, ticker: str):
+        """Return (stat key, meta) for a ticker; meta.json is only ever replaced, so its inode identifies it."""
+        meta_path = self._meta_path(ticker)
+        stat = os.stat(meta_path)
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        return (stat.st_ino, stat.st_mtime_ns), meta
+
+    def tickers(self) -> List[str]:
+        """Tickers with stored bars."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.exists(self._meta_path(name)))
+
+    def has(self, ticker: str) -> bool:
+        """Return True if bars are stored for the ticker."""
+        return os.path.exists(self._meta_path(ticker))
+
+    def version(self, ticker: str) -> Optional[int]:
+        """
+        Version of a ticker's stored bars, increased by every write.
+
+        Costs one ``stat`` unless the bars changed since the last call.
+
+        Returns:
+            Optional[int]: None if no bars are stored
+        """
+        try:
+            stat = os.stat(self._meta_path(ticker))
+        except FileNotFoundError:
+            return None
+        key = (stat.st_ino, stat.st_mtime_ns)
+        cached = self._versions.get(ticker)
+        if cached and cached[0] == key:
+            return cached[1]
+        try:
+            key, meta = self._meta(ticker)
+        except FileNotFoundError:
+            return None
+        version = meta.get("version", 0)
+        self._versions[ticker] = (key, version)
+        return version
+
+    def import_legacy_csv(self, ticker: str) -> bool:
+        """Import a ticker's ``stock_prices.csv`` if it has no stored bars yet."""
+        csv_path = os.path.join(self.root, ticker, self.LEGACY_CSV)
+        if self.has(ticker) or not os.path.exists(csv_path):
+            return False
+        try:
+            frame = pd.read_csv(csv_path, index_col=0)
+            frame.index = pd.to_datetime(frame.index, utc=True)
+            self.write(ticker, frame)
+            return True
+        except Exception as e:
+            print(f"Error importing {csv_path} into price store: {str(e)}")
+            return False
+
+    def migrate_legacy_csvs(self) -> List[str]:
+        """Import every ``stock_prices.csv`` under the root that is not in the store yet."""
+        if not os.path.isdir(self.root):
+            return []
+        return [name for name in sorted(os.listdir(self.root)) if self.import_legacy_csv(name)]
+
+    def _mapped(self, ticker: str):
+        """Return (tz, columns) for a ticker, reopening the maps only when the data changed."""
+        for _ in range(self.READ_ATTEMPTS):
+            key, meta = self._meta(ticker)
+            cached = self._maps.get(ticker)
+            if cached and cached[0] == key:
+                return cached[1], cached[2]
+
+            data_dir = os.path.join(self._dir(ticker), meta.get("data", ""))
+            try:
+                columns = {
+                    name: np.load(os.path.join(data_dir, f"{name}.npy"), mmap_mode="r")
+                    for name in [self.INDEX] + meta["columns"]
+                }
+            except FileNotFoundError:
+                # The version was pruned after its meta was read; a newer one is published
+                continue
+            if any(len(values) != meta["rows"] for values in columns.values()):
+                continue
+            self._maps[ticker] = (key, meta["tz"], columns)
+            return meta["tz"], columns
+        raise RuntimeError(f"Price store for {ticker} kept changing while being read")
+
+    def load(self, ticker: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Load the bars in ``[start, end)`` for a ticker.
+
+        Args:
+            ticker (str): Company stock ticker symbol
+            start: Inclusive lower bound (anything ``pd.Timestamp`` accepts), or None
+            end: Exclusive upper bound, or None
+
+        Returns:
+            pd.DataFrame: OHLCV bars indexed by timestamp; empty if nothing is stored
+        """
+        if not self.has(ticker):
+            return pd.DataFrame(columns=self.COLUMNS)
+
+        tz, columns = self._mapped(ticker)
+        dates = columns[self.INDEX]
+        lo = 0 if start is None else int(np.searchsorted(dates, self._to_ns(start), side="left"))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, self._to_ns(end), side="left"))
+
+        index = pd.DatetimeIndex(pd.to_datetime(dates[lo:hi], utc=True), name=self.INDEX).tz_convert(tz)
+        return pd.DataFrame(
+            {name: values[lo:hi] for name, values in columns.items() if name != self.INDEX},
+            index=index,
+            copy=False,
+        )
+
+    def first_timestamp(self, ticker: str) -> Optional[pd.Timestamp]:
+        return self._edge_timestamp(ticker, 0)
+
+    def last_timestamp(self, ticker: str) -> Optional[pd.Timestamp]:
+        return self._edge_timestamp(ticker, -1)
+
+    def _edge_timestamp(self, ticker: str, position: int) -> Optional[pd.Timestamp]:
+        if not self.has(ticker):
+            return None
+        tz, columns = self._mapped(ticker)
+        dates = columns[self.INDEX]
+        if len(dates) == 0:
+            return None
+        return pd.Timestamp(int(dates[position]), tz="UTC").tz_convert(tz)
+
+    def write(self, ticker: str, frame: pd.DataFrame) -> None:
+        """Replace all stored bars for a ticker with ``frame``."""
+        index = pd.DatetimeIndex(frame.index)
+        tz = str(index.tz) if index.tz is not None else "UTC"
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+        stamps = index.tz_convert("UTC").as_unit("ns").asi8
+
+        order = np.argsort(stamps, kind="stable")
+        arrays = {self.INDEX: stamps[order].astype("int64")}
+        columns = [c for c in self.COLUMNS if c in frame.columns]
+        for name in columns:
+            arrays[name] = frame[name].to_numpy(dtype="float64")[order]
+
+        directory = self._dir(ticker)
+        os.makedirs(directory, exist_ok=True)
+        try:
+            previous = self._meta(ticker)[1]
+        except FileNotFoundError:
+            previous = {}
+        version = previous.get("version", 0) + 1
+        while True:
+            # A concurrent writer may have claimed the same number
+            data_dir = os.path.join(directory, f"v{version}")
+            try:
+                os.mkdir(data_dir)
+                break
+            except FileExistsError:
+                version += 1
+        for name, values in arrays.items():
+            np.save(os.path.join(data_dir, f"{name}.npy"), values)
+
+        # Publishing the new meta.json switches readers to the complete new version at once
+        meta = {"tz": tz, "columns": columns, "rows": int(len(order)), "version": version,
+                "data": os.path.basename(data_dir)}
+        if "covered_from" in previous:
+            meta["covered_from"] = previous["covered_from"]
+        self._write_meta(ticker, meta)
+        self._prune_versions(directory, version)
+
+    def _write_meta(self, ticker: str, meta: Dict) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir(ticker), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path(ticker))
+        self._maps.pop(ticker, None)
+
+    def covered_from(self, ticker: str) -> Optional[pd.Timestamp]:
+        """
+        Earliest time the provider has been asked for bars of this ticker.
+
+        Bars before ``first_timestamp`` back to this point do not exist (the
+        ticker was not listed yet), so they need not be requested again.
+        """
+        try:
+            meta = self._meta(ticker)[1]
+        except FileNotFoundError:
+            return None
+        value = meta.get("covered_from")
+        return None if value is None else pd.Timestamp(int(value), tz="UTC")
+
+    def mark_covered_from(self, ticker: str, start) -> None:
+        """Record that the provider has been asked for bars from ``start`` on (only ever moves back)."""
+        try:
+            meta = self._meta(ticker)[1]
+        except FileNotFoundError:
+            return
+        start_ns = self._to_ns(start)
+        if meta.get("covered_from") is not None and meta["covered_from"] <= start_ns:
+            return
+        meta["covered_from"] = start_ns
+        self._write_meta(ticker, meta)
+
+    def _prune_versions(self, directory: str, version: int) -> None:
+        """Remove versions before the previous one, and column files of the old flat layout."""
+        for entry in os.scandir(directory):
+            try:
+                if entry.is_dir() and entry.name.startswith("v") and entry.name[1:].isdigit():
+                    if int(entry.name[1:]) < version - 1:
+                        shutil.rmtree(entry.path)
+                elif entry.name.endswith(".npy"):
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def merge(self, ticker: str, frame: pd.DataFrame) -> int:
+        """
+        Upsert bars into the store; rows in ``frame`` win over stored rows with the same timestamp.
+
+        Returns:
+            int: Number of timestamps that were not stored before
+        """
+        if frame is None or frame.empty:
+            return 0
+        if not self.has(ticker):
+            self.write(ticker, frame)
+            return len(frame)
+
+        existing = self.load(ticker)
+        incoming = frame.copy()
+        incoming.index = pd.DatetimeIndex(incoming.index)
+        if incoming.index.tz is None:
+            incoming.index = incoming.index.tz_localize("UTC")
+        incoming.index = incoming.index.tz_convert(existing.index.tz)
+
+        added = int((~incoming.index.isin(existing.index)).sum())
+        combined = pd.concat([existing[~existing.index.isin(incoming.index)], incoming])
+        self.write(ticker, combined.sort_index())
+        return added
+
+    @staticmethod
+    def _to_ns(value) -> int:
+        stamp = pd.Timestamp(value)
+        if stamp.tzinfo is None:
+            stamp = stamp.tz_localize("UTC")
+        return int(stamp.tz_convert("UTC").as_unit("ns").value)
@@ -0,0 +1,69 @@
+import os
+import pandas as pd
+
+
+class YFinanceProvider:
+    """Market data provider backed by yfinance."""
+
+    name = "yfinance"
+
+    def ticker(self, symbol):
+        import yfinance as yf
+        return yf.Ticker(symbol)
+
+
+class FixtureTicker:
+    """Offline stand-in for ``yfinance.Ticker`` that reads CSVs from a fixture folder."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"No fixture data at {directory}")
+
+    def _read(self, file_name):
+        return pd.read_csv(os.path.join(self.directory, file_name), index_col=0)
+
+    def history(self, start=None, end=None, **kwargs):
+        bars = self._read("stock_prices.csv")
+        bars.index = pd.to_datetime(bars.index, utc=True)
+        if start is not None:
+            bars = bars[bars.index >= pd.Timestamp(start, tz="UTC")]
+        if end is not None:
+            bars = bars[bars.index < pd.Timestamp(end, tz="UTC")]
+        return bars
+
+    @property
+    def balance_sheet(self):
+        return self._read("balance_sheet.csv")
+
+    @property
+    def income_stmt(self):
+        # company_data folders saved before ingestion wrote income_statement.csv use financials.csv
+        for file_name in ("income_statement.csv", "financials.csv"):
+            if os.path.exists(os.path.join(self.directory, file_name)):
+                return self._read(file_name)
+        return self._read("income_statement.csv")
+
+    @property
+    def cash_flow(self):
+        return self._read("cash_flow.csv")
+
+    @property
+    def info(self):
+        return self._read("company_info.csv").iloc[:, 0].to_dict()
+
+
+class FixtureProvider:
+    """
+    Provider that serves tickers from a local directory laid out like company_data:
+    ``{root}/{symbol}/stock_prices.csv``, ``balance_sheet.csv``, ``income_statement.csv``
+    (or ``financials.csv``), ``cash_flow.csv`` and ``company_info.csv``.
+    """
+
+    name = "fixtures"
+
+    def __init__(self, root):
+        self.root = root
+
+    def ticker(self, symbol):
+        return FixtureTicker(os.path.join(self.root, symbol))
@@ -1,46 +1,133 @@
-import yfinance as yf
 import pandas as pd
 import os
+import argparse
+import tempfile
 from datetime import datetime, timedelta
 
-def extract_financial_data(ticker_symbol):
+try:
+    from Data.price_store import PriceStore, COMPANY_DATA_DIR
+    from Data.providers import YFinanceProvider
+except ImportError:
+    # Running as a script from inside Data/
+    from price_store import PriceStore, COMPANY_DATA_DIR
+    from providers import YFinanceProvider
+
+# Output file -> yfinance.Ticker attribute
+STATEMENTS = {
+    "balance_sheet.csv": "balance_sheet",
+    "income_statement.csv": "income_stmt",
+    "cash_flow.csv": "cash_flow",
+}
+
+# Most recent annual periods kept per statement, in both full and incremental mode
+STATEMENT_PERIODS = 2
+# Annual statements: no newer period can exist until this long after the latest stored one
+STATEMENT_PERIOD = timedelta(days=365)
+# company_info.csv is a snapshot; refresh it at most this often in incremental mode
+INFO_MAX_AGE = timedelta(days=1)
+
+def extract_financial_data(ticker_symbol, incremental=False, end_date=None,
+                           provider=None, output_root=COMPANY_DATA_DIR):
     """
     Extract financial data for a given company ticker using yfinance
     and save it to CSV files in a dedicated folder
+
+    With ``incremental=True`` only data newer than what is already stored is
+    fetched: price bars after the last stored bar, and statement periods after
+    the latest stored period. New rows are appended to the existing files.
+    ``provider`` replaces yfinance as the data source (see Data/providers.py).
     """
-    ticker = yf.Ticker(ticker_symbol)
-    
-    output_dir = f"./company_data/{ticker_symbol}"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    end_date = datetime(2024, 3, 31)
-    start_date = end_date - timedelta(days=366) # 1 year of data
-    
     try:
-        stock_data = ticker.history(start=start_date, end=end_date)
-        stock_data.to_csv(f"{output_dir}/stock_prices.csv")
-        
-        # Financial statements -> keeping it to for 2 years
-        balance_sheet = ticker.balance_sheet
-        balance_sheet.iloc[:,:2].to_csv(f"{output_dir}/balance_sheet.csv")
-        
-        income_stmt = ticker.income_stmt
-        income_stmt.iloc[:,:2].to_csv(f"{output_dir}/income_statement.csv")
-        
-        cash_flow = ticker.cash_flow
-        cash_flow.iloc[:,:2].to_csv(f"{output_dir}/cash_flow.csv")
-        
-        info = pd.DataFrame.from_dict(ticker.info, orient='index')
-        info.to_csv(f"{output_dir}/company_info.csv")
-        
+        ingest_ticker(ticker_symbol, incremental, end_date, provider, output_root)
         print(f"Successfully extracted data for {ticker_symbol}")
         return True
-        
+
     except Exception as e:
         print(f"Error extracting data for {ticker_symbol}: {str(e)}")
         return False
 
+def ingest_ticker(ticker_symbol, incremental=False, end_date=None,
+                  provider=None, output_root=COMPANY_DATA_DIR):
+    """Same as ``extract_financial_data`` but raises on failure instead of returning False."""
+    provider = provider or YFinanceProvider()
+    ticker = provider.ticker(ticker_symbol)
+
+    output_dir = os.path.join(output_root, ticker_symbol)
+    os.makedirs(output_dir, exist_ok=True)
+
+    end_date = end_date or datetime.now()
+    start_date = end_date - timedelta(days=366) # 1 year of data
+
+    store = PriceStore(output_root)
+    if incremental:
+        # Bars from before the columnar store become the base to append to
+        store.import_legacy_csv(ticker_symbol)
+    if incremental and store.has(ticker_symbol):
+        last_bar = store.last_timestamp(ticker_symbol)
+        if last_bar is not None:
+            start_date = last_bar.tz_localize(None).to_pydatetime() + timedelta(days=1)
+        if start_date < end_date:
+            stock_data = ticker.history(start=start_date, end=end_date)
+            added = store.merge(ticker_symbol, stock_data)
+            print(f"{ticker_symbol}: appended {added} price bars")
+    else:
+        stock_data = ticker.history(start=start_date, end=end_date)
+        store.write(ticker_symbol, stock_data)
+
+    # Financial statements -> keeping it to for 2 years
+    for file_name, attribute in STATEMENTS.items():
+        path = os.path.join(output_dir, file_name)
+        if incremental and os.path.exists(path):
+            _append_statement_periods(ticker, attribute, path, end_date)
+        else:
+            _write_csv(getattr(ticker, attribute).iloc[:,:STATEMENT_PERIODS], path)
+
+    info_path = os.path.join(output_dir, "company_info.csv")
+    if not incremental or _is_stale(info_path, INFO_MAX_AGE):
+        info = pd.DataFrame.from_dict(ticker.info, orient='index')
+        _write_csv(info, info_path)
+
+def _append_statement_periods(ticker, attribute, path, end_date):
+    """Prepend statement periods newer than the latest one stored in ``path``."""
+    existing = pd.read_csv(path, index_col=0)
+    existing.columns = pd.to_datetime(existing.columns)
+    latest = existing.columns.max() if len(existing.columns) else None
+
+    # Skip the request entirely while no newer period can have been published
+    if latest is not None and latest + STATEMENT_PERIOD > pd.Timestamp(end_date):
+        return 0
+
+    statement = getattr(ticker, attribute)
+    statement.columns = pd.to_datetime(statement.columns)
+    newer = [c for c in statement.columns if latest is None or c > latest]
+    if not newer:
+        return 0
+
+    combined = pd.concat([statement[newer], existing], axis=1)
+    # Newest first, trimmed to the same window a full extract writes
+    combined = combined[sorted(combined.columns, reverse=True)[:STATEMENT_PERIODS]]
+    _write_csv(combined, path)
+    print(f"{os.path.basename(path)}: appended {len(newer)} periods")
+    return len(newer)
+
+def _is_stale(path, max_age):
+    if not os.path.exists(path):
+        return True
+    return datetime.now() - datetime.fromtimestamp(os.path.getmtime(path)) > max_age
+
+def _write_csv(frame, path):
+    """Write a CSV via a temporary file so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".csv.tmp")
+    os.close(fd)
+    frame.to_csv(tmp_path)
+    os.replace(tmp_path, path)
+
 if __name__ == "__main__":
-    symbols = ['HDB' , 'INFY', 'LICI.NS']
-    for ticker_symbol in symbols:
-        extract_financial_data(ticker_symbol.upper())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Extract company data from yfinance")
+    parser.add_argument("symbols", nargs="*", default=['HDB' , 'INFY', 'LICI.NS'])
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only fetch and append data newer than what is stored")
+    args = parser.parse_args()
+
+    for ticker_symbol in args.symbols:
+        extract_financial_data(ticker_symbol.upper(), incremental=args.incremental)
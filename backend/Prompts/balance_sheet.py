@@ -1,12 +1,14 @@
-import pandas as pd
-from groq import Groq
 import os
 from dotenv import load_dotenv
+from Prompts.llm_client import complete, run_sync
+from Data.analysis_store import analysis_store
+from Prompts.statements import load_statement, statement_path
 
 # Load environment variables
 load_dotenv()
 
-def analyze_balance_sheet(ticker):
+async def analyze_balance_sheet_async(ticker):
+    """Analyze the balance sheet for a ticker and return the generated analysis text."""
     # Get API key from environment variables
     api_key = os.getenv("GROQ_API_KEY")
     
@@ -28,30 +30,20 @@ def analyze_balance_sheet(ticker):
 
     try:
         # Load balance sheet data from CSV file
-        csv_file_path = f"backend/Data/company_data/{ticker}/balance_sheet.csv"
+        csv_file_path = statement_path(ticker, "balance_sheet.csv")
         
         try:
-            df = pd.read_csv(csv_file_path)
+            # Filter relevant metrics and convert to dictionary format
+            csv_data = load_statement(ticker, "balance_sheet.csv", desired_metrics)
         except FileNotFoundError:
             error_msg = f"Error: Could not find balance sheet data file for {ticker}. Please ensure the file exists at {csv_file_path}"
             print(error_msg)
             
             # Create an error file instead
-            output_file_path = f"{ticker}_balance_sheet_analysis.txt"
-            with open(output_file_path, "w") as file:
-                file.write(f"# Analysis Error\n\n{error_msg}")
+            analysis_store.put(ticker, "balance_sheet", f"# Analysis Error\n\n{error_msg}")
             
             raise FileNotFoundError(error_msg)
 
-        # Filter relevant metrics and convert to dictionary format
-        filtered_df = df[df.iloc[:, 0].isin(desired_metrics)]
-        csv_data = filtered_df.set_index(filtered_df.columns[0]).to_dict()[
-            filtered_df.columns[1]
-        ]
-
-        # Initialize the Groq client with the API key from environment variables
-        client = Groq(api_key=api_key)
-
         # Define prompt for AI analysis
         bs_prompt = """
         You are a financial expert who explains things in a simple, easy-to-understand way. Given the balance sheet of a company, analyze it and provide clear insights into the company’s financial health and future prospects. Avoid technical jargon and use everyday language so that someone without a finance background can understand.
@@ -95,35 +87,22 @@ def analyze_balance_sheet(ticker):
 
 
         # Make API call to analyze balance sheet data
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": bs_prompt},
-                {"role": "user", "content": str(csv_data)},
-            ],
-            model="llama-3.3-70b-versatile",
-            temperature=0.8,
-            max_tokens=1024,
-            top_p=1,
-            stop=None,
-            stream=False,
-        )
-
-        # Extract and save AI-generated insights
-        final_output_balance = chat_completion.choices[0].message.content
-        output_file_path = f"{ticker}_balance_sheet_analysis.txt"
-        with open(output_file_path, "w") as file:
-            file.write(final_output_balance)
+        final_output_balance = await complete(bs_prompt, str(csv_data))
+        analysis_store.put(ticker, "balance_sheet", final_output_balance)
 
         print(f"Balance sheet analysis for {ticker} completed successfully")
-        return True
+        return final_output_balance
         
     except Exception as e:
         error_msg = f"Error analyzing balance sheet for {ticker}: {str(e)}"
         print(error_msg)
         
         # Create an error file instead
-        output_file_path = f"{ticker}_balance_sheet_analysis.txt"
-        with open(output_file_path, "w") as file:
-            file.write(f"# Analysis Error\n\n{error_msg}")
+        analysis_store.put(ticker, "balance_sheet", f"# Analysis Error\n\n{error_msg}")
         
-        raise
\ No newline at end of file
+        raise
+
+
+def analyze_balance_sheet(ticker):
+    """Blocking wrapper around ``analyze_balance_sheet_async`` for Streamlit and scripts."""
+    return run_sync(analyze_balance_sheet_async(ticker)) is not None
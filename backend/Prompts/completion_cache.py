@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "completions.sqlite3"
+)
+
+
+class CompletionCache:
+    """
+    Persistent, content-addressed cache of LLM completions backed by SQLite.
+
+    Entries are keyed by a SHA-256 of the model, system prompt, user payload and
+    sampling parameters, expire after ``ttl`` seconds, and the least recently
+    used entries are evicted once the cache exceeds ``max_entries`` or
+    ``max_bytes``. Hit and miss counts are kept per process. Async code uses
+    ``get_async``/``put_async`` so SQLite lock waits never block the event loop.
+    """
+
+    def __init__(self, path=None, ttl=None, max_entries=None, max_bytes=None, enabled=None):
+        self.path = path or os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl = float(ttl if ttl is not None else os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))
+        self.max_entries = int(max_entries if max_entries is not None else os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))
+        self.max_bytes = int(max_bytes if max_bytes is not None else os.getenv("LLM_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+        if enabled is None:
+            enabled = os.getenv("LLM_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model, system_prompt, user_content, **params):
+        """Hash of everything that determines a completion."""
+        payload = json.dumps(
+            {"model": model, "system": system_prompt, "user": user_content, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                " key TEXT PRIMARY KEY, model TEXT, response TEXT,"
+                " created REAL, accessed REAL, size INTEGER)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS completions_accessed ON completions (accessed)")
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """Return the cached completion for ``key``, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT response, created FROM completions WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    conn.commit()
+                self._count(hit=False)
+                return None
+            conn.execute("UPDATE completions SET accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self._count(hit=True)
+            return row[0]
+        except sqlite3.Error as e:
+            print(f"Completion cache read failed: {str(e)}")
+            self._count(hit=False)
+            return None
+
+    def put(self, key, model, response):
+        """Store a completion and evict least recently used entries beyond the size bounds."""
+        if not self.enabled or not response:
+            return
+        try:
+            conn = self._connection()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO completions (key, model, response, created, accessed, size)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, now, now, len(response.encode("utf-8"))),
+            )
+            self._evict(conn, now)
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Completion cache write failed: {str(e)}")
+
+    async def get_async(self, key):
+        """``get`` run in a worker thread (each thread keeps its own connection)."""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, key)
+
+    async def put_async(self, key, model, response):
+        """``put`` run in a worker thread."""
+        if not self.enabled or not response:
+            return
+        await asyncio.to_thread(self.put, key, model, response)
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM completions WHERE created < ?", (now - self.ttl,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        while count > self.max_entries or total > self.max_bytes:
+            row = conn.execute("SELECT key, size FROM completions ORDER BY accessed LIMIT 1").fetchone()
+            if row is None:
+                break
+            conn.execute("DELETE FROM completions WHERE key = ?", (row[0],))
+            count, total = count - 1, total - row[1]
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """Hit/miss counters for this process plus the current size of the cache."""
+        entries, size = 0, 0
+        if self.enabled:
+            try:
+                entries, size = self._connection().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+                ).fetchone()
+            except sqlite3.Error:
+                pass
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def clear(self):
+        self._connection().execute("DELETE FROM completions")
+        self._connection().commit()
+
+
+# Process-wide cache shared by the Prompts modules and the chat service
+completion_cache = CompletionCache()
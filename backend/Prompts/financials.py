@@ -1,12 +1,14 @@
-import pandas as pd
-from groq import Groq
 import os
 from dotenv import load_dotenv
+from Prompts.llm_client import complete, run_sync
+from Data.analysis_store import analysis_store
+from Prompts.statements import load_statement, statement_path
 
 # Load environment variables
 load_dotenv()
 
-def analyze_financials(ticker):
+async def analyze_financials_async(ticker):
+    """Analyze the income statement for a ticker and return the generated analysis text."""
     # Get API key from environment variables
     api_key = os.getenv("GROQ_API_KEY")
     
@@ -81,62 +83,40 @@ def analyze_financials(ticker):
             "Reconciled Depreciation",
         ]
 
-        # Build file path for the financials CSV file using the ticker
-        csv_file_path = f"backend/Data/company_data/{ticker}/financials.csv"
+        # Build file path for the income statement CSV (financials.csv in older folders)
+        csv_file_path = statement_path(ticker, "income_statement.csv")
         
-        # Try reading the CSV file
+        # Try reading the CSV file, keeping only the desired metrics
         try:
-            df = pd.read_csv(csv_file_path)
+            csv_data = load_statement(ticker, "income_statement.csv", important_metrics_income_statement)
         except FileNotFoundError:
             error_msg = f"Error: Could not find data file for {ticker}. Please ensure the file exists at {csv_file_path}"
             print(error_msg)
             
             # Create an error file instead
-            output_file_path = f"{ticker}_financials_analysis.txt"
-            with open(output_file_path, "w") as file:
-                file.write(f"# Analysis Error\n\n{error_msg}")
+            analysis_store.put(ticker, "financials", f"# Analysis Error\n\n{error_msg}")
             
-            return False
+            return None
 
-        # Filter the DataFrame to keep only the desired metrics and convert it to a dictionary
-        filtered_df = df[df.iloc[:, 0].isin(important_metrics_income_statement)]
-        csv_data = filtered_df.set_index(filtered_df.columns[0]).to_dict()[filtered_df.columns[1]]
-        
-        # Initialize the Groq client with the API key
-        client = Groq(api_key=api_key)
-        
         # Make the API call to analyze the financials data using the defined prompt
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": fs_prompt},
-                {"role": "user", "content": str(csv_data)},
-            ],
-            model="llama-3.3-70b-versatile",
-            temperature=0.8,
-            max_tokens=1024,
-            top_p=1,
-            stop=None,
-            stream=False,
-        )
-        
-        # Extract the AI-generated insights from the API response
-        final_output_financials = chat_completion.choices[0].message.content
+        final_output_financials = await complete(fs_prompt, str(csv_data))
         
         # Save the analysis to a file named using the ticker
-        output_file_path = f"{ticker}_financials_analysis.txt"
-        with open(output_file_path, "w") as file:
-            file.write(final_output_financials)
+        analysis_store.put(ticker, "financials", final_output_financials)
         
         print(f"Financial analysis for {ticker} completed successfully")
-        return True
+        return final_output_financials
         
     except Exception as e:
         error_msg = f"Error analyzing financials for {ticker}: {str(e)}"
         print(error_msg)
         
         # Create an error file instead
-        output_file_path = f"{ticker}_financials_analysis.txt"
-        with open(output_file_path, "w") as file:
-            file.write(f"# Analysis Error\n\n{error_msg}")
+        analysis_store.put(ticker, "financials", f"# Analysis Error\n\n{error_msg}")
         
-        raise
\ No newline at end of file
+        raise
+
+
+def analyze_financials(ticker):
+    """Blocking wrapper around ``analyze_financials_async`` for Streamlit and scripts."""
+    return run_sync(analyze_financials_async(ticker)) is not None
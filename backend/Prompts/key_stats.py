@@ -1,12 +1,14 @@
-import pandas as pd
-from groq import Groq
 import os
 from dotenv import load_dotenv
+from Prompts.llm_client import complete, run_sync
+from Data.analysis_store import analysis_store
+from Prompts.statements import load_statement, statement_path
 
 # Load environment variables
 load_dotenv()
 
-def analyze_key_stats(ticker):
+async def analyze_key_stats_async(ticker):
+    """Analyze the key statistics for a ticker and return the generated analysis text."""
     # Get API key from environment variables
     api_key = os.getenv("GROQ_API_KEY")
     
@@ -44,50 +46,26 @@ def analyze_key_stats(ticker):
 
     try:
         # Build the file path for the key statistics CSV file using the ticker
-        csv_file_path = f"backend/Data/company_data/{ticker}/company_info.csv"
-
-        # Load the key statistics data from the CSV file
-        df = pd.read_csv(csv_file_path)
-
-        # Convert the data to a dictionary with metric names as keys and their corresponding values
-        csv_data = df.set_index(df.columns[0]).to_dict()[df.columns[1]]
+        csv_file_path = statement_path(ticker, "company_info.csv")
 
-        # Initialize the Groq client with the API key
-        client = Groq(api_key=api_key)
+        # Load the key statistics as a dictionary with metric names as keys and their corresponding values
+        csv_data = load_statement(ticker, "company_info.csv")
 
         # Make the API call to analyze the key statistics data using the provided prompt
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": str(csv_data)},
-            ],
-            model="llama-3.3-70b-versatile",
-            temperature=0.8,
-            max_tokens=1024,
-            top_p=1,
-            stop=None,
-            stream=False,
-        )
-
-        # Extract the AI-generated insights from the API response
-        final_output_keystats = chat_completion.choices[0].message.content
+        final_output_keystats = await complete(prompt, str(csv_data))
 
         # Save the analysis to a file named using the ticker
-        output_file_path = f"{ticker}_key_stats_analysis.txt"
-        with open(output_file_path, "w") as file:
-            file.write(final_output_keystats)
+        analysis_store.put(ticker, "key_stats", final_output_keystats)
 
         print(f"Key stats analysis for {ticker} completed successfully")
-        return True
+        return final_output_keystats
         
     except FileNotFoundError:
         error_msg = f"Error: Could not find data file for {ticker}. Please ensure the file exists at {csv_file_path}"
         print(error_msg)
         
         # Create an error file instead
-        output_file_path = f"{ticker}_key_stats_analysis.txt"
-        with open(output_file_path, "w") as file:
-            file.write(f"# Analysis Error\n\n{error_msg}")
+        analysis_store.put(ticker, "key_stats", f"# Analysis Error\n\n{error_msg}")
         
         raise FileNotFoundError(error_msg)
         
@@ -96,8 +74,11 @@ def analyze_key_stats(ticker):
         print(error_msg)
         
         # Create an error file instead
-        output_file_path = f"{ticker}_key_stats_analysis.txt"
-        with open(output_file_path, "w") as file:
-            file.write(f"# Analysis Error\n\n{error_msg}")
+        analysis_store.put(ticker, "key_stats", f"# Analysis Error\n\n{error_msg}")
         
-        raise
\ No newline at end of file
+        raise
+
+
+def analyze_key_stats(ticker):
+    """Blocking wrapper around ``analyze_key_stats_async`` for Streamlit and scripts."""
+    return run_sync(analyze_key_stats_async(ticker)) is not None
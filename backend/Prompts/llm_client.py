@@ -0,0 +1,121 @@
+import asyncio
+import os
+import threading
+import weakref
+import httpx
+from groq import AsyncGroq
+from dotenv import load_dotenv
+from Prompts.completion_cache import completion_cache
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+
+# Maximum number of completions in flight per event loop
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+# Seconds before a completion request is abandoned
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+# One pooled client per event loop: httpx connections cannot be shared across loops
+_clients = weakref.WeakKeyDictionary()
+
+_background_loop = None
+_background_lock = threading.Lock()
+
+
+def _get_client():
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(loop)
+    if entry is None:
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY not found in environment variables. Please set this up.")
+
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(LLM_TIMEOUT, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONCURRENCY,
+                max_keepalive_connections=LLM_MAX_CONCURRENCY,
+                keepalive_expiry=60.0,
+            ),
+        )
+        client = AsyncGroq(
+            api_key=api_key,
+            timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=http_client,
+        )
+        entry = (client, asyncio.Semaphore(LLM_MAX_CONCURRENCY))
+        _clients[loop] = entry
+    return entry
+
+
+async def complete(system_prompt, user_content, model=DEFAULT_MODEL,
+                   temperature=0.8, max_tokens=1024, top_p=1, use_cache=True):
+    """
+    Run one chat completion on the shared, kept-alive Groq client.
+
+    Identical requests are answered from the persistent completion cache.
+
+    Args:
+        system_prompt (str): System message
+        user_content (str): User message
+        model (str): Groq model name
+        temperature (float): Sampling temperature
+        max_tokens (int): Maximum tokens to generate
+        top_p (float): Nucleus sampling parameter
+        use_cache (bool): Look up and store the result in the completion cache
+
+    Returns:
+        str: The generated message content
+    """
+    cache_key = completion_cache.make_key(
+        model, system_prompt, user_content,
+        temperature=temperature, max_tokens=max_tokens, top_p=top_p,
+    )
+    if use_cache:
+        cached = await completion_cache.get_async(cache_key)
+        if cached is not None:
+            return cached
+
+    client, semaphore = _get_client()
+    async with semaphore:
+        chat_completion = await client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content},
+            ],
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            stop=None,
+            stream=False,
+        )
+    content = chat_completion.choices[0].message.content
+    if use_cache:
+        await completion_cache.put_async(cache_key, model, content)
+    return content
+
+
+def _get_background_loop():
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_background_loop.run_forever, name="llm-client-loop", daemon=True
+            ).start()
+        return _background_loop
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code (Streamlit, scripts).
+
+    Coroutines run on one long-lived background loop, so blocking callers
+    still share its pooled client and keep-alive connections.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+
+class Pipeline:
+    """
+    Minimal async DAG executor.
+
+    Stages are async callables that receive a dict with the results of the
+    stages they depend on. Every stage starts as soon as its dependencies have
+    finished, so independent stages run concurrently. A failed dependency is
+    left out of the inputs rather than cancelling its dependents; stages decide
+    for themselves how to degrade.
+    """
+
+    def __init__(self, name="pipeline"):
+        self.name = name
+        self._stages = {}
+
+    def add(self, name, func, depends_on=()):
+        """Register ``func(inputs)`` as stage ``name`` running after ``depends_on``."""
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        self._stages[name] = (func, tuple(depends_on))
+        return self
+
+    def _order(self):
+        """Topological order of the stages; raises ValueError on unknown or cyclic dependencies."""
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Cycle in {self.name}: {' -> '.join(path + [name])}")
+            if name not in self._stages:
+                raise ValueError(f"Unknown stage '{name}' in {self.name}")
+            state[name] = "visiting"
+            for dependency in self._stages[name][1]:
+                visit(dependency, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self._stages:
+            visit(name, [])
+        return order
+
+    async def run(self):
+        """
+        Run all stages.
+
+        Returns:
+            dict: ``results`` and ``errors`` per stage name, per-stage ``timings``
+            in seconds and the pipeline's ``total_seconds``
+        """
+        results, errors, timings = {}, {}, {}
+        tasks = {}
+        started = time.perf_counter()
+
+        async def run_stage(name):
+            func, depends_on = self._stages[name]
+            await asyncio.gather(*(tasks[d] for d in depends_on))
+            inputs = {d: results[d] for d in depends_on if d in results}
+            stage_started = time.perf_counter()
+            try:
+                results[name] = await func(inputs)
+            except Exception as e:
+                errors[name] = str(e)
+            finally:
+                timings[name] = round(time.perf_counter() - stage_started, 3)
+
+        # Dependencies are created first, so every awaited task already exists
+        for name in self._order():
+            tasks[name] = asyncio.create_task(run_stage(name))
+        await asyncio.gather(*tasks.values())
+
+        return {
+            "results": results,
+            "errors": errors,
+            "timings": timings,
+            "total_seconds": round(time.perf_counter() - started, 3),
+        }
@@ -0,0 +1,115 @@
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+from Data.price_store import COMPANY_DATA_DIR
+
+# Parsed CSVs and projected metric dicts kept in memory
+MAX_CACHED_FRAMES = 64
+MAX_CACHED_PROJECTIONS = 256
+
+
+class _LRU:
+    """Small thread-safe LRU whose entries are only valid for a given file signature."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, signature):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or entry[0] != signature:
+                return None
+            self._items.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, signature, value):
+        with self._lock:
+            self._items[key] = (signature, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+_frames = _LRU(MAX_CACHED_FRAMES)
+_projections = _LRU(MAX_CACHED_PROJECTIONS)
+
+
+# Ingestion saves the income statement as income_statement.csv; older folders have financials.csv
+STATEMENT_ALIASES = {
+    "income_statement.csv": ("income_statement.csv", "financials.csv"),
+    "financials.csv": ("income_statement.csv", "financials.csv"),
+}
+
+
+def statement_path(ticker, file_name):
+    """
+    Path of a company_data CSV, e.g. ``statement_path('HDB', 'balance_sheet.csv')``.
+
+    Either name of the income statement resolves to whichever file exists.
+    """
+    for name in STATEMENT_ALIASES.get(file_name, (file_name,)):
+        path = os.path.join(COMPANY_DATA_DIR, ticker, name)
+        if os.path.exists(path):
+            return path
+    return os.path.join(COMPANY_DATA_DIR, ticker, file_name)
+
+
+def _signature(path):
+    # Raises FileNotFoundError for missing statements, like pd.read_csv did
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def read_statement(ticker, file_name):
+    """
+    Parse a company_data CSV, reusing the parsed frame until the file changes.
+
+    The returned DataFrame is shared; callers must not modify it.
+    """
+    path = statement_path(ticker, file_name)
+    signature = _signature(path)
+    df = _frames.get(path, signature)
+    if df is None:
+        df = pd.read_csv(path)
+        _frames.put(path, signature, df)
+    return df
+
+
+def load_statement(ticker, file_name, metrics=None):
+    """
+    Load the latest period of a statement as a ``{metric: value}`` dict.
+
+    Args:
+        ticker (str): Company ticker symbol
+        file_name (str): CSV file inside the ticker's company_data folder
+        metrics (list, optional): Row labels to keep; all rows when omitted
+
+    Returns:
+        dict: Metric name -> value of the first (most recent) period column
+    """
+    path = statement_path(ticker, file_name)
+    signature = _signature(path)
+    key = (path, tuple(metrics) if metrics is not None else None)
+
+    projected = _projections.get(key, signature)
+    if projected is None:
+        df = read_statement(ticker, file_name)
+        if metrics is not None:
+            df = df[df.iloc[:, 0].isin(metrics)]
+        projected = df.set_index(df.columns[0]).to_dict()[df.columns[1]]
+        _projections.put(key, signature, projected)
+
+    return dict(projected)
+
+
+def clear_cache():
+    """Drop all cached frames and projections."""
+    _frames.clear()
+    _projections.clear()
@@ -1,12 +1,31 @@
-import pandas as pd
-from groq import Groq
 import os
 from dotenv import load_dotenv
+from Prompts.llm_client import complete, run_sync
+from Data.analysis_store import analysis_store
+from Prompts.pipeline import Pipeline
+from Prompts.balance_sheet import analyze_balance_sheet_async
+from Prompts.cashflow import analyze_cash_flow_async
+from Prompts.financials import analyze_financials_async
+from Prompts.key_stats import analyze_key_stats_async
 
 # Load environment variables
 load_dotenv()
 
-def generate_company_story(ticker):
+# (analysis type, section title) in the order they appear in the story prompt
+STORY_SECTIONS = [
+    ("balance_sheet", "Balance Sheet Analysis"),
+    ("cash_flow", "Cash Flow Analysis"),
+    ("financials", "Financial Performance Analysis"),
+    ("key_stats", "Key Statistics Analysis"),
+]
+
+async def generate_company_story_async(ticker, analyses=None):
+    """
+    Generate the company story for a ticker and return it.
+
+    ``analyses`` maps the STORY_SECTIONS keys to analysis text already in
+    memory; without it the latest stored analyses are used.
+    """
     # Get API key from environment variables
     api_key = os.getenv("GROQ_API_KEY")
     
@@ -14,30 +33,25 @@ def generate_company_story(ticker):
         raise ValueError("GROQ_API_KEY not found in environment variables. Please set this up.")
     
     try:
-        # Read the individual analysis files
-        balance_sheet_file = f"{ticker}_balance_sheet_analysis.txt"
-        cash_flow_file = f"{ticker}_cash_flow_analysis.txt"
-        financials_file = f"{ticker}_financials_analysis.txt"
-        key_stats_file = f"{ticker}_key_stats_analysis.txt"
-        
         # Initialize combined analysis
         combined_analysis = ""
         
-        # Check and read each file if it exists
-        for file_name, section_title in [
-            (balance_sheet_file, "Balance Sheet Analysis"),
-            (cash_flow_file, "Cash Flow Analysis"),
-            (financials_file, "Financial Performance Analysis"),
-            (key_stats_file, "Key Statistics Analysis")
-        ]:
-            try:
-                with open(file_name, "r") as file:
-                    combined_analysis += f"\n\n## {section_title}\n\n"
-                    combined_analysis += file.read()
-            except FileNotFoundError:
-                print(f"Warning: Could not find {file_name}")
-                combined_analysis += f"\n\n## {section_title}\n\n"
+        # Use each in-memory analysis, or the stored one if it exists
+        for key, section_title in STORY_SECTIONS:
+            combined_analysis += f"\n\n## {section_title}\n\n"
+            if analyses is not None:
+                if analyses.get(key):
+                    combined_analysis += analyses[key]
+                else:
+                    print(f"Warning: No {key} analysis for {ticker}")
+                    combined_analysis += f"Analysis not available for {ticker}."
+                continue
+            stored = analysis_store.get(ticker, key)
+            if stored is None:
+                print(f"Warning: Could not find {analysis_store.head_path(ticker, key)}")
                 combined_analysis += f"Analysis not available for {ticker}."
+            else:
+                combined_analysis += stored
         
         # Define the AI prompt for storytelling
         story_prompt = """
@@ -113,67 +127,64 @@ def generate_company_story(ticker):
    
         """
         
-        # Initialize the Groq client with the API key from environment variables
-        client = Groq(api_key=api_key)
-        
         # Make the API call to generate the company story
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": story_prompt},
-                {"role": "user", "content": combined_analysis},
-            ],
-            model="llama-3.3-70b-versatile",
-            temperature=0.8,
-            max_tokens=1500,
-            top_p=1,
-            stop=None,
-            stream=False,
-        )
-        
-        # Extract the AI-generated story
-        final_story = chat_completion.choices[0].message.content
-        
-        # Create directory if it doesn't exist
-        os.makedirs("Analysis", exist_ok=True)
+        final_story = await complete(story_prompt, combined_analysis, max_tokens=1500)
         
-        # Save the story to files in different locations to ensure it can be found
-        output_file_paths = [
-            f"{ticker}_company_story.txt",
-            f"Analysis/{ticker}_company_story.txt",
-            f"backend/Analysis/{ticker}_company_story.txt"
-        ]
-        
-        for path in output_file_paths:
-            try:
-                # Create directory if needed
-                os.makedirs(os.path.dirname(path) if os.path.dirname(path) else ".", exist_ok=True)
-                
-                # Write the file
-                with open(path, "w") as file:
-                    file.write(final_story)
-            except Exception as e:
-                print(f"Warning: Could not save to {path}: {str(e)}")
+        # Save the story once as a new version in the shared analysis store
+        try:
+            analysis_store.put(ticker, "company_story", final_story)
+        except Exception as e:
+            print(f"Warning: Could not save company story for {ticker}: {str(e)}")
         
         print(f"Company story for {ticker} generated successfully")
-        return True
+        return final_story
         
     except Exception as e:
         error_msg = f"Error generating company story for {ticker}: {str(e)}"
         print(error_msg)
         
         # Create an error file instead
-        output_file_paths = [
-            f"{ticker}_company_story.txt",
-            f"Analysis/{ticker}_company_story.txt",
-            f"backend/Analysis/{ticker}_company_story.txt"
-        ]
-        
-        for path in output_file_paths:
-            try:
-                os.makedirs(os.path.dirname(path) if os.path.dirname(path) else ".", exist_ok=True)
-                with open(path, "w") as file:
-                    file.write(f"# Analysis Error\n\n{error_msg}")
-            except Exception:
-                pass
+        try:
+            analysis_store.put(ticker, "company_story", f"# Analysis Error\n\n{error_msg}")
+        except Exception:
+            pass
         
-        raise
\ No newline at end of file
+        raise
+
+
+def generate_company_story(ticker):
+    """Blocking wrapper around ``generate_company_story_async`` for Streamlit and scripts."""
+    return run_sync(generate_company_story_async(ticker)) is not None
+
+
+def build_story_pipeline(ticker):
+    """
+    Company story as a dependency graph: the four statement analyses are
+    independent and run concurrently, the story stage waits for all of them
+    and receives their text in memory.
+    """
+    pipeline = Pipeline(f"{ticker} company story")
+    analysis_stages = {
+        "balance_sheet": analyze_balance_sheet_async,
+        "cash_flow": analyze_cash_flow_async,
+        "financials": analyze_financials_async,
+        "key_stats": analyze_key_stats_async,
+    }
+    for name, analyze in analysis_stages.items():
+        pipeline.add(name, lambda inputs, analyze=analyze: analyze(ticker))
+    pipeline.add(
+        "story",
+        lambda inputs: generate_company_story_async(ticker, analyses=inputs),
+        depends_on=list(analysis_stages),
+    )
+    return pipeline
+
+
+async def run_company_story_pipeline_async(ticker):
+    """Run the full company story pipeline; see ``Pipeline.run`` for the result layout."""
+    return await build_story_pipeline(ticker).run()
+
+
+def run_company_story_pipeline(ticker):
+    """Blocking wrapper around ``run_company_story_pipeline_async`` for Streamlit and scripts."""
+    return run_sync(run_company_story_pipeline_async(ticker))
@@ -14,6 +14,7 @@ from Prompts import (
     key_stats,
     story_tell
 )
+from Data.analysis_store import analysis_store
 
 
 # Optional: Import services from your other app if available
@@ -234,8 +235,7 @@ def balance_sheet_page():
                 balance_sheet.analyze_balance_sheet(ticker)
                 
                 # Read the generated analysis
-                with open(f"{ticker}_balance_sheet_analysis.txt", "r") as file:
-                    analysis = file.read()
+                analysis = analysis_store.get(ticker, "balance_sheet")
                 
                 st.success(f"Balance Sheet Analysis for {TICKER2_MAPPING.get(ticker, ticker)}")
                 st.markdown(analysis)
@@ -255,8 +255,7 @@ def cash_flow_page():
                 cashflow.analyze_cash_flow(ticker)
                 
                 # Read the generated analysis
-                with open(f"{ticker}_cash_flow_analysis.txt", "r") as file:
-                    analysis = file.read()
+                analysis = analysis_store.get(ticker, "cash_flow")
                 
                 st.success(f"Cash Flow Analysis for {TICKER2_MAPPING.get(ticker, ticker)}")
                 st.markdown(analysis)
@@ -276,8 +275,7 @@ def financials_page():
                 financials.analyze_financials(ticker)
                 
                 # Read the generated analysis
-                with open(f"{ticker}_financials_analysis.txt", "r") as file:
-                    analysis = file.read()
+                analysis = analysis_store.get(ticker, "financials")
                 
                 st.success(f"Financial Performance Analysis for {TICKER2_MAPPING.get(ticker, ticker)}")
                 st.markdown(analysis)
@@ -297,8 +295,7 @@ def key_stats_page():
                 key_stats.analyze_key_stats(ticker)
                 
                 # Read the generated analysis
-                with open(f"{ticker}_key_stats_analysis.txt", "r") as file:
-                    analysis = file.read()
+                analysis = analysis_store.get(ticker, "key_stats")
                 
                 st.success(f"Key Statistics Analysis for {TICKER2_MAPPING.get(ticker, ticker)}")
                 st.markdown(analysis)
@@ -315,64 +312,33 @@ def company_story_page():
     if st.button("Generate Company Story") and validate_ticker(ticker):
         with st.spinner("Generating Company Story..."):
             try:
-                # Create a progress bar to show processing steps
-                progress_bar = st.progress(0)
+                # The four statement analyses run concurrently; the story waits for all of them
+                st.info("Running balance sheet, cash flow, financials and key statistics analyses...")
+                result = story_tell.run_company_story_pipeline(ticker)
                 
-                # Run the analysis functions one by one with progress updates
-                try:
-                    st.info("Analyzing balance sheet...")
-                    balance_sheet.analyze_balance_sheet(ticker)
-                    progress_bar.progress(20)
-                except Exception as e:
-                    st.warning(f"Balance sheet analysis failed: {str(e)}")
-                
-                try:
-                    st.info("Analyzing cash flow...")
-                    cashflow.analyze_cash_flow(ticker)
-                    progress_bar.progress(40)
-                except Exception as e:
-                    st.warning(f"Cash flow analysis failed: {str(e)}")
-                
-                try:
-                    st.info("Analyzing financials...")
-                    financials.analyze_financials(ticker)
-                    progress_bar.progress(60)
-                except Exception as e:
-                    st.warning(f"Financial analysis failed: {str(e)}")
-                
-                try:
-                    st.info("Analyzing key statistics...")
-                    key_stats.analyze_key_stats(ticker)
-                    progress_bar.progress(80)
-                except Exception as e:
-                    st.warning(f"Key statistics analysis failed: {str(e)}")
-                
-                # Generate the company story
-                st.info("Generating final company story...")
-                story_tell.generate_company_story(ticker)
-                progress_bar.progress(100)
+                stage_labels = {
+                    "balance_sheet": "Balance sheet analysis",
+                    "cash_flow": "Cash flow analysis",
+                    "financials": "Financial analysis",
+                    "key_stats": "Key statistics analysis",
+                    "story": "Company story",
+                }
+                for stage, error in result["errors"].items():
+                    st.warning(f"{stage_labels.get(stage, stage)} failed: {error}")
                 
-                # Check possible file paths
-                possible_paths = [
-                    f"{ticker}_company_story.txt",
-                    f"backend/Analysis/{ticker}_company_story.txt",
-                    f"Analysis/{ticker}_company_story.txt"
-                ]
+                with st.expander(f"Stage timings (total {result['total_seconds']:.1f}s)"):
+                    st.table(pd.DataFrame(
+                        [(stage_labels.get(stage, stage), seconds) for stage, seconds in result["timings"].items()],
+                        columns=["Stage", "Seconds"]
+                    ))
                 
-                story = None
-                for path in possible_paths:
-                    try:
-                        with open(path, "r") as file:
-                            story = file.read()
-                            break
-                    except FileNotFoundError:
-                        continue
+                story = result["results"].get("story")
                 
                 if story:
                     st.success(f"Company Story for {TICKER2_MAPPING.get(ticker, ticker)}")
                     st.markdown(story)
                 else:
-                    st.error(f"Could not find company story file for {ticker}. Please check file paths.")
+                    st.error(f"Company story could not be generated for {ticker}.")
                 
             except Exception as e:
                 st.error(f"Error generating story: {str(e)}")
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+class JobStatus(BaseModel):
+    job_id: str
+    kind: str
+    key: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+class ScreenRequest(BaseModel):
+    # e.g. "pe < 25 and debt_to_equity < 50 and rsi_14 < 30 and golden_cross"
+    filter: str = ""
+    # Sort expression, ascending; negate for descending, e.g. "-market_cap"
+    sort: Optional[str] = None
+    limit: int = Field(50, ge=1, le=1000)
+    fields: Optional[List[str]] = None
+
+class ScreenResponse(BaseModel):
+    matches: int
+    results: List[Dict[str, Any]]
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+class StoryBatchRequest(BaseModel):
+    tickers: List[str] = Field(..., min_length=1, max_length=500)
+    # e.g. ["company_story", "balance_sheet"]; all stored types when omitted
+    types: Optional[List[str]] = None
+    # Stream one NDJSON line per ticker as soon as its analyses are read
+    stream: bool = False
+
+class StoryBatchResponse(BaseModel):
+    # ticker -> analysis type -> content
+    results: Dict[str, Dict[str, str]]
+    # Requested tickers with no stored analyses
+    missing: List[str]
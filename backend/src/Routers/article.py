@@ -1,45 +1,93 @@
-from fastapi import APIRouter, HTTPException
-from src.Services.article_generator import ArticleGeneratorService
-import os
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from src.Models.jobs import JobStatus
+from src.Routers.http_cache import analyses_response
+from src.Services.article_generator import ArticleGeneratorService, article_jobs
+from src.Services.jobs import JobQueueFullError
 
 router = APIRouter()
 
 @router.post("/article/{companyTicker}")
 async def generate_and_read_analysis(companyTicker: str):
     try:
-        # Generate new analysis
-        await ArticleGeneratorService.generate_company_analysis(companyTicker)
+        # Generate new analysis and read the generated files
+        return await ArticleGeneratorService.generate_and_read(companyTicker)
         
-        # Read generated files
-        base_path = './Analysis'
-        analysis_files = {}
-        
-        files = os.listdir(base_path)
-        company_files = [f for f in files if f.startswith(companyTicker)]
-        
-        if not company_files:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No analysis files generated for company {companyTicker}"
-            )
-        
-        for file_name in company_files:
-            analysis_type = file_name.split('_')[1].replace('_analysis.txt', '')
-            file_path = os.path.join(base_path, file_name)
-            try:
-                with open(file_path, 'r') as file:
-                    analysis_files[analysis_type] = file.read()
-            except Exception as e:
-                print(f"Error reading file {file_path}: {str(e)}")
-                continue
-        
-        return {
-            "company": companyTicker,
-            "analyses": analysis_files
-        }
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing request: {str(e)}"
+        )
+
+@router.get("/article/{companyTicker}")
+async def read_analysis(companyTicker: str, request: Request):
+    """
+    Previously generated analyses of a ticker, without regenerating them
+
+    Cacheable like ``GET /story/{companyTicker}``: ETag from the analyses'
+    content hashes, 304 on a matching ``If-None-Match``.
+    """
+    try:
+        # Index refresh, manifest and cold file reads are blocking I/O
+        return await run_in_threadpool(analyses_response, request, companyTicker)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error processing request: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/article/{companyTicker}/jobs", status_code=202, response_model=JobStatus)
+async def enqueue_analysis(companyTicker: str):
+    """
+    Queue analysis generation and return immediately
+
+    Poll ``GET /article/jobs/{job_id}`` for progress and fetch the analyses
+    from ``GET /article/jobs/{job_id}/result``. A ticker that is already
+    queued or running returns its existing job.
+    """
+    try:
+        job = article_jobs.submit(companyTicker, ArticleGeneratorService.generate_and_read, companyTicker)
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": "10"}
+        )
+    return job.to_dict()
+
+@router.get("/article/jobs/{job_id}", response_model=JobStatus)
+async def get_analysis_job(job_id: str):
+    job = article_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown job {job_id}"
+        )
+    return job.to_dict()
+
+@router.get("/article/jobs/{job_id}/result")
+async def get_analysis_job_result(job_id: str):
+    """Analyses of a finished job; 202 with the job status while it is still pending."""
+    job = article_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown job {job_id}"
+        )
+    if not job.done:
+        return JSONResponse(status_code=202, content=job.to_dict())
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing request: {job.error}"
+        )
+    return job.result
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from src.Models.chat import ChatHistory, ChatMessage
+import json
 from src.Services.chat import ChatResponseService
 
 router = APIRouter()
@@ -22,4 +24,36 @@ async def process_chat(chat_history: ChatHistory):
         return chat_history
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _sse(event: str, data) -> str:
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/chat/stream")
+async def stream_chat(chat_history: ChatHistory):
+    """
+    Stream the assistant's reply as server-sent events.
+
+    Emits ``token`` events (``{"text": ...}``) as chunks arrive, then a single
+    ``done`` event carrying the updated ChatHistory, or an ``error`` event.
+    """
+    async def event_stream():
+        parts = []
+        try:
+            async for text in ChatResponseService.chat_response_stream(chat_history):
+                parts.append(text)
+                yield _sse("token", {"text": text})
+
+            # Finalize the history once the full reply is known
+            chat_history.messages.append(ChatMessage(role="assistant", content="".join(parts)))
+            yield _sse("done", chat_history.model_dump())
+
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
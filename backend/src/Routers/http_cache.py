@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from src.Services.artifacts import artifact_store
+
+# How long browsers and CDNs may reuse stored analyses before revalidating
+ANALYSIS_MAX_AGE = int(os.getenv("ANALYSIS_MAX_AGE", "60"))
+
+
+def make_etag(payload: Any, weak: bool = False) -> str:
+    """
+    ETag derived from a JSON-serializable payload.
+
+    Pass ``weak=True`` for responses that may be gzipped: the same tag then
+    covers every content coding, which RFC 9110 only allows for weak tags.
+    """
+    body = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    tag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    return f"W/{tag}" if weak else tag
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    opaque = lambda tag: tag[2:] if tag.startswith("W/") else tag
+    return "*" in candidates or opaque(etag) in [opaque(tag) for tag in candidates]
+
+
+def artifacts_etag(ticker: str, digests: Dict[str, str]) -> str:
+    """ETag from the SHA-256 versions of a ticker's artifacts (weak: the JSON may be gzipped)."""
+    return make_etag([ticker, sorted(digests.items())], weak=True)
+
+
+def cache_headers(etag: str, max_age: int = ANALYSIS_MAX_AGE) -> Dict[str, str]:
+    # Shared caches may keep serving a stale copy briefly while they revalidate
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={max_age * 5}",
+    }
+
+
+def analyses_response(request: Request, ticker: str, types: Optional[Iterable[str]] = None,
+                      cacheable: bool = True) -> Response:
+    """
+    Stored analyses of a ticker as a JSON response.
+
+    With ``cacheable`` (GET routes) the response carries an ETag built from
+    the content hashes the analysis store records, plus ``Cache-Control``, so
+    a revalidation that ends in 304 never reads the analyses themselves.
+
+    Raises:
+        HTTPException: 404 if the ticker has no analyses
+    """
+    digests = artifact_store.digests(ticker, types)
+    if not digests:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No analysis files found for company {ticker}"
+        )
+
+    etag = artifacts_etag(ticker, digests)
+    if cacheable and is_not_modified(request, etag):
+        return Response(status_code=304, headers=cache_headers(etag))
+
+    artifacts = artifact_store.read_all(ticker, list(digests))
+    content = {
+        "company": ticker,
+        "analyses": {analysis_type: artifact.content for analysis_type, artifact in artifacts.items()}
+    }
+    if not cacheable:
+        return JSONResponse(content=content)
+    # Tag what was actually read, in case a new version was published in between
+    etag = artifacts_etag(ticker, {analysis_type: artifact.sha256 for analysis_type, artifact in artifacts.items()})
+    return JSONResponse(content=content, headers=cache_headers(etag))
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException
+from starlette.concurrency import run_in_threadpool
+from src.Models.screen import ScreenRequest, ScreenResponse
+from src.Services.screener import ScreenerService, ScreenExpressionError
+
+router = APIRouter()
+
+@router.post("/screen", response_model=ScreenResponse)
+async def screen_stocks(request: ScreenRequest):
+    """
+    Screen the whole ticker universe with filter and sort expressions
+
+    Metrics include fundamentals (pe, forward_pe, price_to_book, debt_to_equity,
+    market_cap, profit_margin, roe, dividend_yield, beta, sector, ...) and the
+    latest technicals (close, sma_50, sma_200, rsi_14, macd, atr_14,
+    golden_cross, ma_crossover, ...).
+    """
+    try:
+        # The first screen after a data change rebuilds the metrics frame; keep it off the loop
+        return await run_in_threadpool(
+            ScreenerService.screen,
+            request.filter,
+            request.sort,
+            request.limit,
+            request.fields,
+        )
+    except ScreenExpressionError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error running screen: {str(e)}"
+        )
@@ -1,13 +1,91 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from src.Models.chat import ChatHistory, ChatMessage
+from src.Models.story import StoryBatchRequest, StoryBatchResponse
 from src.Services.chat import ChatResponseService
-import os
-from typing import Dict, List
+from src.Services.artifacts import artifact_store
+from src.Routers.http_cache import analyses_response
+from typing import Dict, List, Optional
 
 router = APIRouter()
 
+async def _read_story(ticker: str, types: Optional[List[str]]) -> Dict:
+    artifacts = await run_in_threadpool(artifact_store.read_all, ticker, types)
+    return {
+        "company": ticker,
+        "analyses": {analysis_type: artifact.content for analysis_type, artifact in artifacts.items()}
+    }
+
+async def _read_story_line(ticker: str, types: Optional[List[str]]) -> str:
+    try:
+        story = await _read_story(ticker, types)
+    except Exception as e:
+        story = {"company": ticker, "error": f"Error reading analyses: {str(e)}"}
+    if "analyses" in story and not story["analyses"]:
+        story = {"company": ticker, "error": "No analysis files found"}
+    return json.dumps(story) + "\n"
+
+async def _stream_stories(tickers: List[str], types: Optional[List[str]]):
+    # One line per ticker, in completion order
+    for line in asyncio.as_completed([_read_story_line(ticker, types) for ticker in tickers]):
+        yield await line
+
+@router.post("/story/batch", response_model=StoryBatchResponse)
+async def read_analysed_files_batch(request: StoryBatchRequest):
+    """
+    Analyses of many tickers in one round-trip, e.g. for a watchlist
+
+    Tickers are read concurrently from the artifact index. With ``stream``
+    set, the response is NDJSON with one ``{"company", "analyses"}`` line per
+    ticker (or ``{"company", "error"}`` if it has none) as each is read.
+    Declared before ``/story/{companyTicker}`` so "batch" is not taken as a ticker.
+    """
+    tickers = list(dict.fromkeys(request.tickers))
+
+    if request.stream:
+        return StreamingResponse(
+            _stream_stories(tickers, request.types),
+            media_type="application/x-ndjson"
+        )
+
+    try:
+        stories = await asyncio.gather(*(_read_story(ticker, request.types) for ticker in tickers))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing request: {str(e)}"
+        )
+    return {
+        "results": {story["company"]: story["analyses"] for story in stories if story["analyses"]},
+        "missing": [story["company"] for story in stories if not story["analyses"]]
+    }
+
+@router.get("/story/{companyTicker}")
+async def get_analysed_files(companyTicker: str, request: Request):
+    """
+    Cacheable read of all analysis files for a company ticker.
+
+    Responses carry an ETag built from the analyses' content hashes and a
+    ``Cache-Control`` lifetime (``ANALYSIS_MAX_AGE``); a matching
+    ``If-None-Match`` is answered with 304 without reading the files.
+    """
+    try:
+        # Index refresh, manifest and cold file reads are blocking I/O
+        return await run_in_threadpool(analyses_response, request, companyTicker)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing request: {str(e)}"
+        )
+
 @router.post("/story/{companyTicker}")
-async def read_analysed_files(companyTicker: str):
+async def read_analysed_files(companyTicker: str, request: Request):
     """
     Reads all analysis files for a given company ticker from the Analysis directory.
     
@@ -15,47 +93,20 @@ async def read_analysed_files(companyTicker: str):
         companyTicker (str): The company ticker symbol (e.g., 'HDB', 'INFY')
         
     Returns:
-        Dict[str, str]: Dictionary containing analysis type and content
+        Dict[str, str]: Dictionary containing analysis type (e.g. 'balance_sheet',
+            'company_story') and content
         
     Raises:
         HTTPException: If no files found for the company or if there's an error
     """
     try:
-        base_path = './Analysis'
-        analysis_files = {}
-        
-        # Get all files in Analysis directory
-        files = os.listdir(base_path)
-        
-        # Filter files that start with the company ticker
-        company_files = [f for f in files if f.startswith(companyTicker)]
-        
-        if not company_files:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No analysis files found for company {companyTicker}"
-            )
-        
-        # Read content of each file
-        for file_name in company_files:
-            # Extract analysis type from filename (e.g., 'financials' from 'HDB_financials_analysis.txt')
-            analysis_type = file_name.split('_')[1].replace('_analysis.txt', '')
-            
-            file_path = os.path.join(base_path, file_name)
-            try:
-                with open(file_path, 'r') as file:
-                    analysis_files[analysis_type] = file.read()
-            except Exception as e:
-                print(f"Error reading file {file_path}: {str(e)}")
-                continue
-        
-        return {
-            "company": companyTicker,
-            "analyses": analysis_files
-        }
+        # Same payload as the GET route, kept for existing clients; POST responses are not cached
+        return await run_in_threadpool(analyses_response, request, companyTicker, None, False)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error processing request: {str(e)}"
-        )
\ No newline at end of file
+        )
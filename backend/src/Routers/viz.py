@@ -1,29 +1,136 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from src.Services.viz import VisualizationService
-from typing import Dict, Any
+from src.Services.chart_renderer import RendererBusyError
+from src.Routers.http_cache import make_etag, is_not_modified
+from typing import Dict, Any, Literal
+import base64
+import hashlib
+import json
 
 router = APIRouter()
 
+MEDIA_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "json": "application/json",
+}
+# Single charts only change when prices or statements do; let browsers reuse them briefly
+CHART_MAX_AGE = 300
+
+
+def _chart_bytes(chart: Any, image_format: str) -> bytes:
+    """Turn a chart as returned by VisualizationService into a raw response body."""
+    if image_format == "png":
+        return base64.b64decode(chart.split(",", 1)[1])
+    if image_format == "svg":
+        return chart.encode("utf-8")
+    return json.dumps(chart, separators=(",", ":")).encode("utf-8")
+
 @router.get("/visualize/{ticker}")
-async def get_company_visualizations(ticker: str) -> Dict[str, Any]:
+async def get_company_visualizations(
+    ticker: str,
+    request: Request,
+    response: Response,
+    image_format: Literal["png", "svg", "json"] = Query("png", alias="format"),
+    width: int = Query(800, ge=200, le=4000),
+    years: float = Query(3, gt=0, le=30),
+) -> Dict[str, Any]:
     """
     Get interactive visualizations for a company's financial data
+
+    Responses carry an ETag; a matching If-None-Match is answered with 304.
     
     Args:
         ticker (str): Company stock ticker symbol
+        format (str): "png" for base64 PNG data URIs, "svg" for SVG markup,
+            or "json" for plotly figure JSON to render client-side
+        width (int): Chart width in pixels; price bars are resampled to fit it
+        years (float): Length of the price history window
         
     Returns:
         Dict containing various visualizations and metrics
     """
     try:
-        visualizations = await VisualizationService.get_stock_visualizations(ticker)
-        return {
+        visualizations = await VisualizationService.get_stock_visualizations(
+            ticker, image_format, width=width, years=years
+        )
+        payload = {
             "status": "success",
             "company": ticker,
+            "format": image_format,
             "visualizations": visualizations
         }
+
+        etag = make_etag(payload, weak=True)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if is_not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+        return payload
+    except RendererBusyError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": "5"}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=str(e)
+        )
+
+
+@router.get("/visualize/{ticker}/{chart}.{ext}")
+async def get_company_chart(
+    ticker: str,
+    chart: Literal["stock_price", "revenue_growth", "profitability"],
+    ext: Literal["png", "svg", "json"],
+    request: Request,
+    width: int = Query(800, ge=200, le=4000),
+    years: float = Query(3, gt=0, le=30),
+) -> Response:
+    """
+    Get a single chart as a raw image (or plotly JSON) body
+
+    Only the requested chart is built, e.g. ``/visualize/INFY/profitability.png``.
+    
+    Args:
+        ticker (str): Company stock ticker symbol
+        chart (str): stock_price, revenue_growth or profitability
+        ext (str): png, svg or json
+        width (int): Chart width in pixels
+        years (float): Length of the price history window
+        
+    Returns:
+        Response with the chart bytes and matching content type
+    """
+    try:
+        image = await VisualizationService.get_chart(ticker, chart, ext, width=width, years=years)
+    except RendererBusyError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": "5"}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+    if not image:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No {chart} chart available for {ticker}"
+        )
+
+    body = _chart_bytes(image, ext)
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    if ext != "png":
+        # SVG and JSON may be gzipped; one tag for both codings must be weak
+        etag = f"W/{etag}"
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={CHART_MAX_AGE}"}
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=MEDIA_TYPES[ext], headers=headers)
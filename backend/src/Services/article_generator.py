@@ -1,52 +1,93 @@
+import asyncio
 import yfinance as yf
 from typing import Dict, Any, List
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import requests
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
+from src.Services.market_data import MarketDataService
+from src.Services import indicators
+from src.Services.fundamentals import FundamentalsService
+from src.Services.jobs import JobQueue
+from src.Services.singleflight import SingleFlight
+from src.Services.artifacts import artifact_store
+from Data.analysis_store import analysis_store
 
 load_dotenv()
 
+# Background article generation, see /api/article/{ticker}/jobs
+article_jobs = JobQueue("article", workers=int(os.getenv("ARTICLE_JOB_WORKERS", "2")))
+
+# Concurrent generations of one ticker share a single run; a finished run is
+# reused for ARTICLE_SHARE_TTL seconds so a burst of requests costs one set of LLM calls
+article_flight = SingleFlight("article", share_ttl=float(os.getenv("ARTICLE_SHARE_TTL", "60")))
+
 class ArticleGeneratorService:
     @staticmethod
     async def generate_company_analysis(ticker: str) -> Dict[str, Any]:
         """Generate comprehensive company analysis articles"""
+        return await article_flight.do(ticker, ArticleGeneratorService._generate_company_analysis, ticker)
+
+    @staticmethod
+    async def _generate_company_analysis(ticker: str) -> Dict[str, Any]:
         try:
             company = yf.Ticker(ticker)
             
-            # Create Analysis directory if it doesn't exist
-            os.makedirs('./Analysis', exist_ok=True)
-            
-            # Generate different types of analysis
+            # Generate different types of analysis; each runs its yfinance calls in a thread
             analyses = {
                 'financials': await ArticleGeneratorService._generate_financial_analysis(company, ticker),
                 'business': await ArticleGeneratorService._generate_business_analysis(company, ticker),
                 'technical': await ArticleGeneratorService._generate_technical_analysis(company, ticker)
             }
             
-            # Save analyses to files
+            # Save each analysis as a new version in the shared store
             for analysis_type, content in analyses.items():
                 if content:
-                    filename = f"./Analysis/{ticker}_{analysis_type}_analysis.txt"
-                    with open(filename, 'w') as f:
-                        f.write(content)
+                    await asyncio.to_thread(analysis_store.put, ticker, analysis_type, content)
             
             return analyses
             
         except Exception as e:
             raise Exception(f"Error generating analysis: {str(e)}")
 
+    @staticmethod
+    async def generate_and_read(ticker: str) -> Dict[str, Any]:
+        """
+        Generate the analyses for a ticker and read back its saved analyses
+
+        Returns:
+            Dict with the company ticker and its analyses by type
+
+        Raises:
+            FileNotFoundError: If no analysis files exist for the ticker afterwards
+        """
+        await ArticleGeneratorService.generate_company_analysis(ticker)
+        
+        # Read back every analysis of exactly this ticker, not just the ones generated here
+        artifacts = await asyncio.to_thread(artifact_store.read_all, ticker)
+        
+        if not artifacts:
+            raise FileNotFoundError(f"No analysis files generated for company {ticker}")
+        
+        analysis_files = {analysis_type: artifact.content for analysis_type, artifact in artifacts.items()}
+        
+        return {
+            "company": ticker,
+            "analyses": analysis_files
+        }
+
     @staticmethod
     async def _generate_financial_analysis(company, ticker: str) -> str:
         """Generate financial analysis article"""
         try:
-            # Get financial data
-            income_stmt = company.income_stmt
-            balance_sheet = company.balance_sheet
-            cashflow = company.cashflow
+            # Map the statements onto canonical line items, whatever yfinance calls them
+            fundamentals = await asyncio.to_thread(FundamentalsService.from_company, ticker, company)
             
-            if income_stmt is None or balance_sheet is None or cashflow is None:
+            if np.isnan(fundamentals.values).all():
                 return ""
+            ratios = fundamentals.ratios()
                 
             # Create analysis content
             analysis = f"""Financial Analysis for {ticker}
@@ -54,19 +95,19 @@ Generated on {datetime.now().strftime('%Y-%m-%d')}
 
 Revenue Analysis:
 ----------------
-{ArticleGeneratorService._analyze_revenue(income_stmt)}
+{ArticleGeneratorService._analyze_revenue(fundamentals, ratios)}
 
 Profitability Analysis:
 ----------------------
-{ArticleGeneratorService._analyze_profitability(income_stmt)}
+{ArticleGeneratorService._analyze_profitability(fundamentals, ratios)}
 
 Balance Sheet Analysis:
 ---------------------
-{ArticleGeneratorService._analyze_balance_sheet(balance_sheet)}
+{ArticleGeneratorService._analyze_balance_sheet(fundamentals, ratios)}
 
 Cash Flow Analysis:
 -----------------
-{ArticleGeneratorService._analyze_cashflow(cashflow)}
+{ArticleGeneratorService._analyze_cashflow(fundamentals, ratios)}
 """
             return analysis
             
@@ -75,12 +116,24 @@ Cash Flow Analysis:
             return ""
 
     @staticmethod
-    def _analyze_revenue(income_stmt) -> str:
+    def _latest(fundamentals, name: str) -> float:
+        """Most recent value of a line item; raises if the company does not report it."""
+        value = fundamentals.latest(name)[0]
+        if np.isnan(value):
+            raise ValueError(f"no {name.replace('_', ' ')} reported")
+        return value
+
+    @staticmethod
+    def _analyze_revenue(fundamentals, ratios) -> str:
         try:
-            revenue = income_stmt.loc['Total Revenue']
-            latest_revenue = revenue.iloc[-1]
-            yoy_growth = (revenue.iloc[-1] - revenue.iloc[-2]) / revenue.iloc[-2] * 100
+            latest_revenue = ArticleGeneratorService._latest(fundamentals, 'revenue')
+            yoy_growth = ratios['revenue_growth'][0, 0] * 100
             
+            if np.isnan(yoy_growth):
+                return f"""
+Latest Revenue: ${latest_revenue:,.2f}
+Year-over-Year Growth: N/A (single period reported)
+"""
             return f"""
 Latest Revenue: ${latest_revenue:,.2f}
 Year-over-Year Growth: {yoy_growth:.2f}%
@@ -90,18 +143,15 @@ Revenue Trend: {'Positive' if yoy_growth > 0 else 'Negative'}
             return f"Unable to analyze revenue: {str(e)}"
 
     @staticmethod
-    def _analyze_profitability(income_stmt) -> str:
+    def _analyze_profitability(fundamentals, ratios) -> str:
         try:
-            net_income = income_stmt.loc['Net Income']
-            operating_income = income_stmt.loc['Operating Income']
-            
-            latest_net_income = net_income.iloc[-1]
-            latest_operating_income = operating_income.iloc[-1]
+            latest_net_income = ArticleGeneratorService._latest(fundamentals, 'net_income')
+            latest_operating_income = ArticleGeneratorService._latest(fundamentals, 'operating_income')
             
             return f"""
 Net Income: ${latest_net_income:,.2f}
 Operating Income: ${latest_operating_income:,.2f}
-Profit Margin: {(latest_net_income / income_stmt.loc['Total Revenue'].iloc[-1] * 100):.2f}%
+Profit Margin: {ratios['net_margin'][0, 0] * 100:.2f}%
 """
         except Exception as e:
             return f"Unable to analyze profitability: {str(e)}"
@@ -111,7 +161,8 @@ Profit Margin: {(latest_net_income / income_stmt.loc['Total Revenue'].iloc[-1] *
     async def _generate_business_analysis(company, ticker: str) -> str:
         """Generate business analysis article"""
         try:
-            info = company.info
+            # Ticker.info is a blocking network call
+            info = await asyncio.to_thread(getattr, company, 'info')
             if not info:
                 return ""
                 
@@ -155,16 +206,23 @@ P/E Ratio: {info.get('trailingPE', 'N/A')}
             # Get historical data for technical analysis
             end_date = datetime.now()
             start_date = end_date - timedelta(days=365)
-            history = company.history(start=start_date, end=end_date)
+            # May top up the price store from yfinance and write it; keep that off the event loop
+            history = await asyncio.to_thread(MarketDataService.get_history, ticker, start_date, end_date)
             
             if history.empty:
                 return ""
                 
-            # Calculate some basic technical indicators
-            current_price = history['Close'][-1]
-            ma_50 = history['Close'].tail(50).mean()
-            ma_200 = history['Close'].tail(200).mean()
-            rsi = ArticleGeneratorService._calculate_rsi(history['Close'])
+            # Full indicator series; the article reports the latest values
+            close = history['Close']
+            current_price = close.iloc[-1]
+            ma_50 = indicators.sma(close, 50, min_periods=1).iloc[-1]
+            ma_200 = indicators.sma(close, 200, min_periods=1).iloc[-1]
+            rsi = indicators.rsi(close).iloc[-1]
+            if pd.isna(rsi):
+                rsi = 50  # Not enough bars yet; report neutral
+            macd_line, signal_line, _ = indicators.macd(close)
+            _, upper_band, lower_band = indicators.bollinger_bands(close)
+            atr = indicators.atr(history['High'], history['Low'], close).iloc[-1]
             
             analysis = f"""Technical Analysis for {ticker}
 Generated on {datetime.now().strftime('%Y-%m-%d')}
@@ -174,17 +232,20 @@ Price Analysis:
 Current Price: ${current_price:.2f}
 50-Day Moving Average: ${ma_50:.2f}
 200-Day Moving Average: ${ma_200:.2f}
+Bollinger Bands (20, 2): ${lower_band.iloc[-1]:.2f} - ${upper_band.iloc[-1]:.2f}
 
 Technical Indicators:
 ------------------
 Trend (50 MA vs 200 MA): {'Bullish' if ma_50 > ma_200 else 'Bearish'}
 RSI (14-period): {rsi:.2f}
 Market Condition: {'Overbought' if rsi > 70 else 'Oversold' if rsi < 30 else 'Neutral'}
+MACD (12, 26, 9): {macd_line.iloc[-1]:.2f} (signal {signal_line.iloc[-1]:.2f}, {'Bullish' if macd_line.iloc[-1] > signal_line.iloc[-1] else 'Bearish'})
+Average True Range (14): ${atr:.2f}
 
 Volume Analysis:
 --------------
 Average Volume (10 days): {history['Volume'].tail(10).mean():,.0f}
-Latest Volume: {history['Volume'][-1]:,.0f}
+Latest Volume: {history['Volume'].iloc[-1]:,.0f}
 """
             return analysis
             
@@ -193,47 +254,37 @@ Latest Volume: {history['Volume'][-1]:,.0f}
             return ""
 
     @staticmethod
-    def _calculate_rsi(prices, periods=14):
-        """Calculate Relative Strength Index"""
-        try:
-            deltas = prices.diff()
-            seed = deltas[:periods+1]
-            up = seed[seed >= 0].sum()/periods
-            down = -seed[seed < 0].sum()/periods
-            rs = up/down
-            rsi = 100 - (100/(1+rs))
-            return rsi
-        except Exception:
-            return 50  # Return neutral RSI if calculation fails
-
-    @staticmethod
-    def _analyze_balance_sheet(balance_sheet) -> str:
+    def _analyze_balance_sheet(fundamentals, ratios) -> str:
         try:
-            assets = balance_sheet.loc['Total Assets'].iloc[-1]
-            liabilities = balance_sheet.loc['Total Liabilities'].iloc[-1]
-            equity = assets - liabilities
+            assets = ArticleGeneratorService._latest(fundamentals, 'total_assets')
+            liabilities = ArticleGeneratorService._latest(fundamentals, 'total_liabilities')
+            equity = ratios['equity'][0, 0]
+            # Prefer reported debt; fall back to total liabilities when it is missing
+            debt_to_equity = ratios['debt_to_equity'][0, 0]
+            if np.isnan(debt_to_equity):
+                debt_to_equity = ratios['liabilities_to_equity'][0, 0]
             
             return f"""
 Total Assets: ${assets:,.2f}
 Total Liabilities: ${liabilities:,.2f}
 Shareholders Equity: ${equity:,.2f}
-Debt to Equity Ratio: {(liabilities / equity):.2f}
+Debt to Equity Ratio: {debt_to_equity:.2f}
 """
         except Exception as e:
             return f"Unable to analyze balance sheet: {str(e)}"
 
     @staticmethod
-    def _analyze_cashflow(cashflow) -> str:
+    def _analyze_cashflow(fundamentals, ratios) -> str:
         try:
-            operating_cf = cashflow.loc['Operating Cash Flow'].iloc[-1]
-            investing_cf = cashflow.loc['Investing Cash Flow'].iloc[-1]
-            financing_cf = cashflow.loc['Financing Cash Flow'].iloc[-1]
+            operating_cf = ArticleGeneratorService._latest(fundamentals, 'operating_cash_flow')
+            investing_cf = ArticleGeneratorService._latest(fundamentals, 'investing_cash_flow')
+            financing_cf = ArticleGeneratorService._latest(fundamentals, 'financing_cash_flow')
             
             return f"""
 Operating Cash Flow: ${operating_cf:,.2f}
 Investing Cash Flow: ${investing_cf:,.2f}
 Financing Cash Flow: ${financing_cf:,.2f}
-Free Cash Flow: ${(operating_cf + investing_cf):,.2f}
+Free Cash Flow: ${ratios['free_cash_flow'][0, 0]:,.2f}
 """
         except Exception as e:
-            return f"Unable to analyze cash flow: {str(e)}"
\ No newline at end of file
+            return f"Unable to analyze cash flow: {str(e)}"
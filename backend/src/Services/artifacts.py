@@ -0,0 +1,181 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from Data.analysis_store import AnalysisStore, analysis_store
+
+# Analysis files are named {ticker}_{type}_analysis.txt, or {ticker}_company_story.txt
+ARTIFACT_NAME = re.compile(r"^(?P<ticker>[^_]+)_(?P<type>.+?)(?:_analysis)?\.txt$")
+
+
+@dataclass(frozen=True)
+class Artifact:
+    ticker: str
+    analysis_type: str
+    path: str
+    # (mtime_ns, size) of the file when it was indexed/read
+    version: Tuple[int, int]
+    content: Optional[str] = None
+    # SHA-256 of the content, the identifier the analysis store versions it by
+    sha256: Optional[str] = None
+
+
+def parse_artifact_name(file_name: str) -> Optional[Tuple[str, str]]:
+    """
+    Split an analysis file name into (ticker, analysis type).
+
+    ``HDB_balance_sheet_analysis.txt`` -> ("HDB", "balance_sheet"),
+    ``LICI.NS_company_story.txt`` -> ("LICI.NS", "company_story").
+    """
+    match = ARTIFACT_NAME.match(file_name)
+    if not match:
+        return None
+    return match.group("ticker"), match.group("type")
+
+
+class ArtifactStore:
+    """
+    Index of the analysis head files under ``Analysis/``.
+
+    The index maps ticker -> analysis type -> file and is rebuilt only when
+    the directory's mtime changes (a file was added, removed or renamed), so
+    lookups never scan the directory. File contents are kept in an LRU bounded
+    by total size and re-read only when a file's mtime or size changes.
+    """
+
+    def __init__(self, root: str = None, max_bytes: int = None):
+        self.root = root or analysis_store.root
+        self.max_bytes = max_bytes or int(os.getenv("ARTIFACT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        self._index: Dict[str, Dict[str, str]] = {}
+        self._index_version = None
+        self._contents: "OrderedDict[str, Tuple[Tuple[int, int], str, str]]" = OrderedDict()
+        # Version manifests written alongside the head files
+        self._analyses = analysis_store if self.root == analysis_store.root else AnalysisStore(self.root)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        try:
+            version = os.stat(self.root).st_mtime_ns
+        except FileNotFoundError:
+            version = None
+        with self._lock:
+            if version == self._index_version:
+                return
+
+        index: Dict[str, Dict[str, str]] = {}
+        if version is not None:
+            with os.scandir(self.root) as entries:
+                for entry in entries:
+                    parsed = parse_artifact_name(entry.name)
+                    if parsed is None or not entry.is_file():
+                        continue
+                    ticker, analysis_type = parsed
+                    index.setdefault(ticker, {})[analysis_type] = entry.path
+
+        with self._lock:
+            self._index = index
+            self._index_version = version
+
+    def tickers(self) -> List[str]:
+        self._refresh()
+        with self._lock:
+            return sorted(self._index)
+
+    def types(self, ticker: str) -> List[str]:
+        """Analysis types available for exactly this ticker."""
+        self._refresh()
+        with self._lock:
+            return sorted(self._index.get(ticker, {}))
+
+    def stat(self, ticker: str, analysis_type: str) -> Optional[Artifact]:
+        """Locate an artifact and its current version without reading it."""
+        self._refresh()
+        with self._lock:
+            path = self._index.get(ticker, {}).get(analysis_type)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return Artifact(ticker, analysis_type, path, (stat.st_mtime_ns, stat.st_size))
+
+    def digests(self, ticker: str, types: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        SHA-256 of each of a ticker's current artifacts.
+
+        Taken from the analysis store's manifests, so the content is not read;
+        only head files written before the store existed are hashed (once,
+        alongside their cached content).
+        """
+        wanted = self.types(ticker) if types is None else types
+        digests = {}
+        for analysis_type in wanted:
+            if self.stat(ticker, analysis_type) is None:
+                continue
+            recorded = self._analyses.versions(ticker, analysis_type)
+            if recorded:
+                digests[analysis_type] = recorded[-1]["sha256"]
+                continue
+            artifact = self.read(ticker, analysis_type)
+            if artifact is not None:
+                digests[analysis_type] = artifact.sha256
+        return digests
+
+    def read(self, ticker: str, analysis_type: str) -> Optional[Artifact]:
+        """
+        Get one artifact with its content.
+
+        Returns:
+            Optional[Artifact]: None if the ticker has no artifact of that type
+        """
+        artifact = self.stat(ticker, analysis_type)
+        if artifact is None:
+            return None
+
+        with self._lock:
+            cached = self._contents.get(artifact.path)
+            if cached is not None and cached[0] == artifact.version:
+                self._contents.move_to_end(artifact.path)
+                return Artifact(ticker, analysis_type, artifact.path, artifact.version, cached[1], cached[2])
+
+        try:
+            with open(artifact.path, "r") as file:
+                content = file.read()
+        except FileNotFoundError:
+            return None
+        sha256 = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        self._remember(artifact.path, artifact.version, content, sha256)
+        return Artifact(ticker, analysis_type, artifact.path, artifact.version, content, sha256)
+
+    def read_all(self, ticker: str, types: Optional[Iterable[str]] = None) -> Dict[str, Artifact]:
+        """Artifacts of a ticker by type, limited to ``types`` when given."""
+        wanted = self.types(ticker) if types is None else types
+        artifacts = {}
+        for analysis_type in wanted:
+            artifact = self.read(ticker, analysis_type)
+            if artifact is not None:
+                artifacts[analysis_type] = artifact
+        return artifacts
+
+    def _remember(self, path: str, version: Tuple[int, int], content: str, sha256: str) -> None:
+        size = len(content)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._contents.pop(path, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._contents[path] = (version, content, sha256)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted, _) = self._contents.popitem(last=False)
+                self._bytes -= len(evicted)
+
+
+# Process-wide index over the shared analysis store's root
+artifact_store = ArtifactStore()
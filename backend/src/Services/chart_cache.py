@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import pandas as pd
+
+DEFAULT_CHART_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache", "charts"
+)
+
+
+class ChartCache:
+    """
+    Two-tier cache of rendered charts.
+
+    Keys are fingerprints of the ticker, chart type, input series and layout
+    parameters, so a chart is only re-rendered when its data or presentation
+    changes. Hot entries live in an in-memory LRU; every entry is also written
+    to disk so restarts and other workers start warm. Async callers use
+    ``get_async``/``put_async``, which do the disk tier's I/O in a thread.
+    """
+
+    # Pruning trims the disk tier to this fraction of its limit, so it runs once per many puts
+    PRUNE_TO = 0.9
+
+    def __init__(self, directory: str = None, max_items: int = None, max_disk_items: int = None):
+        self.directory = directory or os.getenv("CHART_CACHE_DIR", DEFAULT_CHART_CACHE_DIR)
+        self.max_items = max_items or int(os.getenv("CHART_CACHE_MAX_ITEMS", "256"))
+        self.max_disk_items = max_disk_items or int(os.getenv("CHART_CACHE_MAX_DISK_ITEMS", "5000"))
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        # Entries on disk, counted once and then tracked on writes
+        self._disk_items: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(ticker: str, chart: str, data, layout: Dict[str, Any]) -> str:
+        """
+        Fingerprint one chart's inputs.
+
+        Args:
+            ticker (str): Company stock ticker symbol
+            chart (str): Chart type, e.g. "stock_price"
+            data: Series/DataFrame (or a list of them) the chart is built from
+            layout (Dict[str, Any]): Everything else that changes the output (size, format, ...)
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([ticker, chart, layout], sort_keys=True, default=str).encode("utf-8"))
+        for item in data if isinstance(data, (list, tuple)) else [data]:
+            if item is None:
+                digest.update(b"\0")
+                continue
+            digest.update(pd.util.hash_pandas_object(item, index=True).values.tobytes())
+            if isinstance(item, pd.DataFrame):
+                digest.update(json.dumps([str(c) for c in item.columns]).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        try:
+            with open(self._path(key), "r") as f:
+                value = json.load(f)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        self._remember(key, value)
+        with self._lock:
+            self.hits += 1
+        return value
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """``get`` that reads the disk tier off the event loop."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        return await asyncio.to_thread(self.get, key)
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable chart payload in both tiers."""
+        self._remember(key, value)
+        self._write_disk(key, value)
+
+    async def put_async(self, key: str, value: Any) -> None:
+        """``put`` that writes (and prunes) the disk tier off the event loop."""
+        self._remember(key, value)
+        await asyncio.to_thread(self._write_disk, key, value)
+
+    def _write_disk(self, key: str, value: Any) -> None:
+        try:
+            path = self._path(key)
+            existed = os.path.exists(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing chart cache entry: {str(e)}")
+            return
+
+        with self._lock:
+            if self._disk_items is not None and not existed:
+                self._disk_items += 1
+            due = self._disk_items is None or self._disk_items > self.max_disk_items
+        if due:
+            self._prune_disk()
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def _prune_disk(self) -> None:
+        """Count the disk tier and, if over the limit, drop the oldest entries down to ``PRUNE_TO``."""
+        if not self._prune_lock.acquire(blocking=False):
+            return  # Another thread is already pruning
+        try:
+            entries = []
+            for root, _, files in os.walk(self.directory):
+                entries.extend(os.path.join(root, name) for name in files if name.endswith(".json"))
+            if len(entries) > self.max_disk_items:
+                entries.sort(key=self._mtime)
+                keep = int(self.max_disk_items * self.PRUNE_TO)
+                for path in entries[:len(entries) - keep]:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                entries = entries[len(entries) - keep:]
+            with self._lock:
+                self._disk_items = len(entries)
+        finally:
+            self._prune_lock.release()
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+
+# Process-wide chart cache
+chart_cache = ChartCache()
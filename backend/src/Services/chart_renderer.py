@@ -0,0 +1,109 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Renderer processes kept warm for kaleido rasterization
+RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", "2"))
+# Renders allowed in flight (running + queued) before new requests are rejected
+RENDER_QUEUE_SIZE = int(os.getenv("CHART_RENDER_QUEUE_SIZE", "16"))
+RENDER_TIMEOUT = float(os.getenv("CHART_RENDER_TIMEOUT", "60"))
+
+
+class RendererBusyError(Exception):
+    """Raised when the render queue is full."""
+
+
+def _init_worker():
+    """Import plotly/kaleido and render once so the first real request pays no start-up cost."""
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    try:
+        import kaleido
+        pio.kaleido.scope.mathjax = None
+    except Exception:
+        print("Kaleido not available. Using default rendering.")
+    try:
+        pio.to_image(go.Figure(), format="png", width=10, height=10)
+    except Exception as e:
+        print(f"Renderer warm-up failed: {str(e)}")
+
+
+def _render(fig_json: str, image_format: str, scale: float) -> bytes:
+    import plotly.io as pio
+    return pio.to_image(pio.from_json(fig_json), format=image_format, scale=scale)
+
+
+def _ping() -> bool:
+    return True
+
+
+class ChartRenderer:
+    """
+    Rasterizes plotly figures in a pool of pre-warmed worker processes.
+
+    Rendering never runs on the event loop, and at most ``RENDER_QUEUE_SIZE``
+    renders may be pending; beyond that ``render`` raises RendererBusyError so
+    callers can shed load instead of piling up work.
+    """
+
+    _executor = None
+    _pending = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _get_executor() -> ProcessPoolExecutor:
+        with ChartRenderer._lock:
+            if ChartRenderer._executor is None:
+                ChartRenderer._executor = ProcessPoolExecutor(
+                    max_workers=RENDER_WORKERS,
+                    # spawn: forking a threaded server process is unsafe
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return ChartRenderer._executor
+
+    @staticmethod
+    def start() -> None:
+        """Spawn and warm every renderer process ahead of the first request."""
+        executor = ChartRenderer._get_executor()
+        for _ in range(RENDER_WORKERS):
+            executor.submit(_ping)
+
+    @staticmethod
+    def shutdown() -> None:
+        with ChartRenderer._lock:
+            if ChartRenderer._executor is not None:
+                ChartRenderer._executor.shutdown(wait=False, cancel_futures=True)
+                ChartRenderer._executor = None
+
+    @staticmethod
+    async def render(fig, image_format: str = "png", scale: float = 2) -> bytes:
+        """
+        Render a plotly figure to image bytes off the event loop.
+
+        Args:
+            fig: Plotly figure
+            image_format (str): Any format kaleido supports (png, svg, ...)
+            scale (float): Resolution multiplier
+
+        Returns:
+            bytes: Encoded image
+
+        Raises:
+            RendererBusyError: If too many renders are already pending
+        """
+        with ChartRenderer._lock:
+            if ChartRenderer._pending >= RENDER_QUEUE_SIZE:
+                raise RendererBusyError("Chart renderer is busy, try again shortly")
+            ChartRenderer._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                ChartRenderer._get_executor(), _render, fig.to_json(), image_format, scale
+            )
+            return await asyncio.wait_for(future, timeout=RENDER_TIMEOUT)
+        finally:
+            with ChartRenderer._lock:
+                ChartRenderer._pending -= 1
@@ -1,63 +1,94 @@
 import os
 import google.generativeai as genai
 from src.Models.chat import ChatHistory, ChatMessage
-from typing import List, Dict
+from typing import List, Dict, AsyncIterator, Optional
 from dotenv import load_dotenv
+from Prompts.completion_cache import completion_cache
+from Data.analysis_store import analysis_store
+from src.Services.retrieval import RetrievalService
+from src.Services.chat_memory import ChatMemoryService
 
 load_dotenv()
 
 # Configure Gemini
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-model = genai.GenerativeModel('gemini-2.0-flash')
+MODEL_NAME = 'gemini-2.0-flash'
+model = genai.GenerativeModel(MODEL_NAME)
 
 class ChatResponseService:
-    ANALYSIS_TYPES = {
-        'financials': '_financials_analysis.txt',
-        'balance_sheet': '_balance_sheet_analysis.txt',
-        'cash_flow': '_cash_flow_analysis.txt'
-    }
+    ANALYSIS_TYPES = ('financials', 'balance_sheet', 'cash_flow')
+    # Number of analysis chunks retrieved into each prompt
+    TOP_K = int(os.getenv("CHAT_TOP_K", "4"))
 
     @staticmethod
-    def read_analysis_files(company: str) -> Dict[str, str]:
-        """Read all analysis files for a given company."""
-        analysis_contents = {}
-        base_path = './Analysis'
-        
-        for analysis_type, file_suffix in ChatResponseService.ANALYSIS_TYPES.items():
-            file_path = f"{base_path}/{company}{file_suffix}"
-            try:
-                with open(file_path, 'r') as file:
-                    analysis_contents[analysis_type] = file.read()
-            except FileNotFoundError:
-                print(f"Warning: {file_path} not found")
-                analysis_contents[analysis_type] = f"No {analysis_type} analysis available."
-        
-        return analysis_contents
+    def analysis_paths(company: str) -> Dict[str, str]:
+        """Analysis type -> head file path for a given company."""
+        return {
+            analysis_type: analysis_store.head_path(company, analysis_type)
+            for analysis_type in ChatResponseService.ANALYSIS_TYPES
+        }
 
     @staticmethod
-    async def chat_response(chat_history: ChatHistory) -> str:
-        try:
-            # Read all analysis files for the company
-            analyses = ChatResponseService.read_analysis_files(chat_history.company)
-            
-            # Combine all analyses into a comprehensive document
-            combined_analysis = "\n\n".join([
-                f"### {analysis_type.upper()} ANALYSIS:\n{content}" 
-                for analysis_type, content in analyses.items()
-            ])
-
-            # Convert chat history to text format
-            chat_text = "\n\n".join([
-                f"{'User' if msg.role == 'user' else 'Assistant'}: {msg.content}"
-                for msg in chat_history.messages
-            ])
-
-            # Create the enhanced prompt with instructions for simpler responses
-            prompt = f"""
+    def _format_messages(messages: List[ChatMessage]) -> str:
+        return "\n\n".join([
+            f"{'User' if msg.role == 'user' else 'Assistant'}: {msg.content}"
+            for msg in messages
+        ])
+
+    @staticmethod
+    async def summarize_messages(previous_summary: Optional[str], messages: List[ChatMessage]) -> str:
+        """Fold older messages into the running conversation summary."""
+        prompt = f"""
+            Summarize this conversation between a user and a financial advisor so it can replace the original messages.
+            Keep every question asked, the companies, figures and conclusions discussed, and any user preferences.
+            Write at most 200 words in plain prose.
+
+            Summary so far:
+            {previous_summary or "(none)"}
+
+            New messages to fold in:
+            {ChatResponseService._format_messages(messages)}
+            """
+
+        cache_key = completion_cache.make_key(MODEL_NAME, "", prompt)
+        cached = await completion_cache.get_async(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await model.generate_content_async(prompt)
+        await completion_cache.put_async(cache_key, MODEL_NAME, response.text)
+        return response.text
+
+    @staticmethod
+    async def build_prompt(chat_history: ChatHistory) -> str:
+        """Build the Gemini prompt from the company's analyses and the conversation."""
+        # Retrieve only the analysis chunks relevant to the latest question
+        index = RetrievalService.get_index(
+            chat_history.company, ChatResponseService.analysis_paths(chat_history.company)
+        )
+        user_messages = [msg.content for msg in chat_history.messages if msg.role == "user"]
+        query = user_messages[-1] if user_messages else chat_history.company
+        excerpts = index.search(query, k=ChatResponseService.TOP_K)
+
+        combined_analysis = "\n\n".join([
+            f"### {analysis_type.upper()} ANALYSIS (excerpt):\n{chunk}"
+            for analysis_type, chunk, _ in excerpts
+        ]) or f"No analysis available for {chat_history.company}."
+
+        # Older turns are folded into a running summary; recent ones stay verbatim
+        summary, recent_messages = await ChatMemoryService.compact(
+            chat_history, ChatResponseService.summarize_messages
+        )
+        chat_text = ChatResponseService._format_messages(recent_messages)
+        if summary:
+            chat_text = f"Summary of the earlier conversation: {summary}\n\n{chat_text}"
+
+        # Create the enhanced prompt with instructions for simpler responses
+        return f"""
             Context:
             You are a friendly financial advisor explaining {chat_history.company}'s financial information to a regular person who might not be familiar with complex financial terms.
 
-            Document Analyses:
+            Relevant Excerpts from Document Analyses:
             {combined_analysis}
 
             Previous Conversation:
@@ -76,13 +107,54 @@ class ChatResponseService:
             Please respond to the last user message following these guidelines.
             """
 
+    @staticmethod
+    async def chat_response(chat_history: ChatHistory) -> str:
+        try:
+            prompt = await ChatResponseService.build_prompt(chat_history)
+
+            # Identical prompts (same analyses and conversation) are served from the cache
+            cache_key = completion_cache.make_key(MODEL_NAME, "", prompt)
+            cached = await completion_cache.get_async(cache_key)
+            if cached is not None:
+                return cached
+
             # Generate response using the complete prompt
             response = await model.generate_content_async(prompt)
             # print(response)
             if not response.text:
                 return "I apologize, but I couldn't generate a response."
             
+            await completion_cache.put_async(cache_key, MODEL_NAME, response.text)
             return response.text
 
         except Exception as e:
-            raise Exception(f"Error in chat response: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error in chat response: {str(e)}")
+
+    @staticmethod
+    async def chat_response_stream(chat_history: ChatHistory) -> AsyncIterator[str]:
+        """Yield the assistant's reply in chunks as Gemini generates them."""
+        try:
+            prompt = await ChatResponseService.build_prompt(chat_history)
+
+            cache_key = completion_cache.make_key(MODEL_NAME, "", prompt)
+            cached = await completion_cache.get_async(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+            response = await model.generate_content_async(prompt, stream=True)
+            parts = []
+            async for chunk in response:
+                text = chunk.text
+                if text:
+                    parts.append(text)
+                    yield text
+
+            if not parts:
+                yield "I apologize, but I couldn't generate a response."
+                return
+
+            await completion_cache.put_async(cache_key, MODEL_NAME, "".join(parts))
+
+        except Exception as e:
+            raise Exception(f"Error in chat response: {str(e)}")
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Tuple
+from src.Models.chat import ChatHistory, ChatMessage
+
+# summarize(previous_summary, messages_to_fold) -> new summary
+Summarizer = Callable[[Optional[str], List[ChatMessage]], Awaitable[str]]
+
+
+class ChatMemoryService:
+    """
+    Rolling summarization of long conversations.
+
+    Everything but the last ``RECENT_MESSAGES`` messages is folded into a running
+    summary. Summaries are cached under a hash of the conversation prefix they
+    cover, so the next request in the same conversation only folds the messages
+    that scrolled out of the window since the previous turn.
+    """
+
+    # "compact" folds older turns into a summary, "full" sends the whole history
+    MODE = os.getenv("CHAT_HISTORY_MODE", "compact")
+    RECENT_MESSAGES = int(os.getenv("CHAT_RECENT_MESSAGES", "6"))
+    MAX_SUMMARIES = 1024
+
+    _summaries: "OrderedDict[str, str]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _prefix_hashes(company: str, messages: List[ChatMessage], upto: int) -> List[str]:
+        """hashes[i] identifies the conversation made of the first ``i`` messages."""
+        digest = hashlib.sha256(company.encode("utf-8")).hexdigest()
+        hashes = [digest]
+        for msg in messages[:upto]:
+            digest = hashlib.sha256(f"{digest}\x1f{msg.role}\x1f{msg.content}".encode("utf-8")).hexdigest()
+            hashes.append(digest)
+        return hashes
+
+    @staticmethod
+    def _get(key: str) -> Optional[str]:
+        with ChatMemoryService._lock:
+            summary = ChatMemoryService._summaries.get(key)
+            if summary is not None:
+                ChatMemoryService._summaries.move_to_end(key)
+            return summary
+
+    @staticmethod
+    def _put(key: str, summary: str) -> None:
+        with ChatMemoryService._lock:
+            ChatMemoryService._summaries[key] = summary
+            ChatMemoryService._summaries.move_to_end(key)
+            while len(ChatMemoryService._summaries) > ChatMemoryService.MAX_SUMMARIES:
+                ChatMemoryService._summaries.popitem(last=False)
+
+    @staticmethod
+    async def compact(chat_history: ChatHistory, summarize: Summarizer) -> Tuple[Optional[str], List[ChatMessage]]:
+        """
+        Split a conversation into a summary of older turns and the recent messages.
+
+        Args:
+            chat_history (ChatHistory): Full conversation
+            summarize (Summarizer): Folds messages into a previous summary
+
+        Returns:
+            Tuple[Optional[str], List[ChatMessage]]: Summary (None if nothing was
+            folded) and the messages to include verbatim
+        """
+        messages = chat_history.messages
+        keep = max(ChatMemoryService.RECENT_MESSAGES, 1)
+        if ChatMemoryService.MODE != "compact" or len(messages) <= keep:
+            return None, messages
+
+        fold_upto = len(messages) - keep
+        hashes = ChatMemoryService._prefix_hashes(chat_history.company, messages, fold_upto)
+
+        # Resume from the longest prefix that was already summarized
+        start, summary = 0, None
+        for i in range(fold_upto, 0, -1):
+            summary = ChatMemoryService._get(hashes[i])
+            if summary is not None:
+                start = i
+                break
+
+        if start < fold_upto:
+            summary = await summarize(summary, messages[start:fold_upto])
+            ChatMemoryService._put(hashes[fold_upto], summary)
+
+        return summary, messages[fold_upto:]
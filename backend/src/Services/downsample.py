@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+
+# Candidate bar sizes from finest to coarsest: (pandas rule, approximate duration)
+OHLC_RULES = [
+    ("h", timedelta(hours=1)),
+    ("D", timedelta(days=1)),
+    ("W-FRI", timedelta(days=7)),
+    ("MS", timedelta(days=30.44)),
+    ("QS", timedelta(days=91.31)),
+    ("YS", timedelta(days=365.25)),
+]
+
+# A candlestick needs a few pixels to stay readable
+MIN_PX_PER_BAR = 3
+
+
+def pick_ohlc_rule(index: pd.DatetimeIndex, width_px: int, min_px_per_bar: int = MIN_PX_PER_BAR):
+    """
+    Choose the finest bar size that fits the date range into the chart width.
+
+    Returns:
+        str or None: pandas resample rule, or None if the bars already fit
+    """
+    max_bars = max(width_px // min_px_per_bar, 1)
+    if len(index) <= max_bars:
+        return None
+
+    span = index[-1] - index[0]
+    native = (span / (len(index) - 1)) if len(index) > 1 else timedelta(0)
+    for rule, duration in OHLC_RULES:
+        if duration <= native:
+            continue
+        if span / duration <= max_bars:
+            return rule
+    return OHLC_RULES[-1][0]
+
+
+def resample_ohlc(bars: pd.DataFrame, width_px: int, min_px_per_bar: int = MIN_PX_PER_BAR) -> pd.DataFrame:
+    """
+    Aggregate OHLCV bars (daily -> weekly/monthly/..., intraday -> hourly/daily)
+    so that their count scales with the chart width instead of the date range.
+    """
+    if bars.empty:
+        return bars
+    rule = pick_ohlc_rule(bars.index, width_px, min_px_per_bar)
+    if rule is None:
+        return bars
+
+    aggregation = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    aggregation = {column: how for column, how in aggregation.items() if column in bars.columns}
+    resampled = bars.resample(rule).agg(aggregation)
+    return resampled.dropna(subset=[c for c in ("Open", "Close") if c in resampled.columns])
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of ``threshold`` points that keep the
+    visual shape of a line.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def downsample_series(series: pd.Series, width_px: int) -> pd.Series:
+    """Reduce a line series to about one point per pixel with LTTB."""
+    series = series.dropna()
+    if len(series) <= width_px:
+        return series
+    if isinstance(series.index, pd.DatetimeIndex):
+        x = series.index.asi8.astype("float64")
+    else:
+        x = np.arange(len(series), dtype="float64")
+    return series.iloc[lttb_indices(x, series.to_numpy(dtype="float64"), width_px)]
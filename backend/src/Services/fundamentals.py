@@ -0,0 +1,228 @@
+"""
+Normalized fundamentals.
+
+yfinance labels the same line item differently across companies and API
+versions ("Total Revenue" / "Revenue", "Total Liabilities" / "Total
+Liabilities Net Minority Interest", ...). Statements are mapped onto one
+canonical schema and held as a float array shaped (ticker, period, item), with
+period 0 the most recent fiscal year, so ratios are computed for every ticker
+and period in a single array expression.
+"""
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from Prompts.statements import read_statement
+
+# Canonical line item -> source labels, most preferred first
+LINE_ITEMS: Dict[str, List[str]] = {
+    "revenue": ["Total Revenue", "Revenues", "Revenue", "Operating Revenue"],
+    "cost_of_revenue": ["Cost Of Revenue", "Reconciled Cost Of Revenue"],
+    "gross_profit": ["Gross Profit"],
+    "operating_income": ["Operating Income", "OperatingIncome", "Total Operating Income As Reported", "EBIT"],
+    "ebitda": ["EBITDA", "Normalized EBITDA"],
+    "net_income": ["Net Income", "NetIncome", "Net Income Common Stockholders",
+                   "Net Income From Continuing Operation Net Minority Interest"],
+    "diluted_eps": ["Diluted EPS"],
+    "total_assets": ["Total Assets"],
+    "total_liabilities": ["Total Liabilities", "Total Liabilities Net Minority Interest"],
+    "stockholders_equity": ["Stockholders Equity", "Total Stockholders Equity", "Common Stock Equity",
+                            "Total Equity Gross Minority Interest"],
+    "total_debt": ["Total Debt"],
+    "current_assets": ["Current Assets", "Total Current Assets"],
+    "current_liabilities": ["Current Liabilities", "Total Current Liabilities"],
+    "cash": ["Cash And Cash Equivalents", "Cash Cash Equivalents And Short Term Investments"],
+    "operating_cash_flow": ["Operating Cash Flow", "Cash Flow From Continuing Operating Activities",
+                            "Total Cash From Operating Activities"],
+    "investing_cash_flow": ["Investing Cash Flow", "Cash Flow From Continuing Investing Activities",
+                            "Total Cashflows From Investing Activities"],
+    "financing_cash_flow": ["Financing Cash Flow", "Cash Flow From Continuing Financing Activities",
+                            "Total Cash From Financing Activities"],
+    "capital_expenditure": ["Capital Expenditure", "Capital Expenditures", "Capital Expenditure Reported"],
+    "free_cash_flow": ["Free Cash Flow"],
+}
+ITEMS = list(LINE_ITEMS)
+ITEM_INDEX = {item: i for i, item in enumerate(ITEMS)}
+
+# Annual statements to keep per ticker
+MAX_PERIODS = 5
+
+# company_data file names; statement_path also finds financials.csv from older extracts
+STATEMENT_FILES = [
+    ("income_stmt", ["income_statement.csv"]),
+    ("balance_sheet", ["balance_sheet.csv"]),
+    ("cashflow", ["cash_flow.csv"]),
+]
+
+# Flattened alias table: source label -> canonical item, in preference order
+_ALIAS_LABELS = [label for labels in LINE_ITEMS.values() for label in labels]
+_ALIAS_ITEMS = [item for item, labels in LINE_ITEMS.items() for _ in labels]
+
+
+def canonicalize(statement: pd.DataFrame) -> pd.DataFrame:
+    """
+    Map one statement (labels x period columns) onto canonical line items.
+
+    When several aliases of an item are present the most preferred non-empty
+    one wins, period by period.
+    """
+    if statement is None or statement.empty:
+        return pd.DataFrame(index=ITEMS, dtype="float64")
+    statement = statement[~statement.index.duplicated()]
+    aliased = statement.reindex(_ALIAS_LABELS)
+    aliased.index = _ALIAS_ITEMS
+    aliased = aliased.apply(pd.to_numeric, errors="coerce")
+    return aliased.groupby(level=0, sort=False).first().reindex(ITEMS)
+
+
+def line_item(statement: pd.DataFrame, item: str) -> Optional[pd.Series]:
+    """The row of ``statement`` holding a canonical item, or None if no alias is present."""
+    if statement is None or statement.empty:
+        return None
+    for label in LINE_ITEMS[item]:
+        if label in statement.index:
+            return statement.loc[label]
+    return None
+
+
+class FundamentalsPanel:
+    """
+    Canonical fundamentals for many tickers.
+
+    Attributes:
+        tickers (List[str]): Row labels of the first axis
+        period_ends (np.ndarray): (ticker, period) fiscal period end dates, NaT when missing
+        values (np.ndarray): (ticker, period, item) float64, NaN when missing
+    """
+
+    def __init__(self, tickers: List[str], period_ends: np.ndarray, values: np.ndarray):
+        self.tickers = tickers
+        self.period_ends = period_ends
+        self.values = values
+
+    @staticmethod
+    def from_statements(statements: Dict[str, Dict[str, pd.DataFrame]],
+                        max_periods: int = MAX_PERIODS) -> "FundamentalsPanel":
+        """
+        Build a panel from raw statements.
+
+        Args:
+            statements: ticker -> {"income_stmt"|"balance_sheet"|"cashflow": DataFrame}
+                with line-item labels as the index and period end dates as columns
+            max_periods (int): Most recent periods kept per ticker
+        """
+        tickers = list(statements)
+        values = np.full((len(tickers), max_periods, len(ITEMS)), np.nan)
+        period_ends = np.full((len(tickers), max_periods), np.datetime64("NaT"), dtype="datetime64[ns]")
+
+        for row, ticker in enumerate(tickers):
+            frames = []
+            for frame in statements[ticker].values():
+                if frame is None or frame.empty:
+                    continue
+                frame = frame.copy()
+                frame.columns = pd.to_datetime(frame.columns, errors="coerce")
+                frames.append(canonicalize(frame.loc[:, frame.columns.notna()]))
+            if not frames:
+                continue
+
+            # Statements share fiscal year ends; each contributes the items it has
+            combined = pd.concat(frames, axis=1).T.groupby(level=0).first()
+            combined = combined.sort_index(ascending=False).head(max_periods)
+            values[row, :len(combined)] = combined[ITEMS].to_numpy(dtype="float64")
+            period_ends[row, :len(combined)] = combined.index.to_numpy(dtype="datetime64[ns]")
+
+        return FundamentalsPanel(tickers, period_ends, values)
+
+    def item(self, name: str) -> np.ndarray:
+        """(ticker, period) array of one canonical line item."""
+        return self.values[:, :, ITEM_INDEX[name]]
+
+    def latest(self, name: str, ticker: Optional[str] = None):
+        """Most recent period's value of an item, per ticker or for one ticker."""
+        latest = self.item(name)[:, 0]
+        return latest[self.tickers.index(ticker)] if ticker is not None else latest
+
+    def ratios(self) -> Dict[str, np.ndarray]:
+        """
+        Standard ratios for every ticker and period at once.
+
+        Returns:
+            Dict of (ticker, period) arrays. Growth rates compare a period with
+            the one before it, so the oldest period's growth is NaN.
+        """
+        item = self.item
+        free_cash_flow = np.where(
+            np.isnan(item("free_cash_flow")),
+            item("operating_cash_flow") + item("capital_expenditure"),
+            item("free_cash_flow"),
+        )
+        # Book equity, falling back to assets minus liabilities
+        equity = np.where(
+            np.isnan(item("stockholders_equity")),
+            item("total_assets") - item("total_liabilities"),
+            item("stockholders_equity"),
+        )
+        return {
+            "gross_margin": _divide(item("gross_profit"), item("revenue")),
+            "operating_margin": _divide(item("operating_income"), item("revenue")),
+            "net_margin": _divide(item("net_income"), item("revenue")),
+            "debt_to_equity": _divide(item("total_debt"), equity),
+            "liabilities_to_equity": _divide(item("total_liabilities"), equity),
+            "current_ratio": _divide(item("current_assets"), item("current_liabilities")),
+            "return_on_equity": _divide(item("net_income"), equity),
+            "free_cash_flow": free_cash_flow,
+            "fcf_margin": _divide(free_cash_flow, item("revenue")),
+            "revenue_growth": _growth(item("revenue")),
+            "net_income_growth": _growth(item("net_income")),
+            "equity": equity,
+        }
+
+    def to_frame(self, period: int = 0) -> pd.DataFrame:
+        """Line items and ratios of one period (0 = latest), one row per ticker."""
+        frame = pd.DataFrame(self.values[:, period, :], index=pd.Index(self.tickers, name="ticker"), columns=ITEMS)
+        for name, values in self.ratios().items():
+            frame[name] = values[:, period]
+        return frame
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator == 0, np.nan, numerator / denominator)
+
+
+def _growth(values: np.ndarray) -> np.ndarray:
+    """Period-over-period change; periods run newest first along axis 1."""
+    previous = np.full_like(values, np.nan)
+    previous[:, :-1] = values[:, 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(previous == 0, np.nan, (values - previous) / np.abs(previous))
+
+
+class FundamentalsService:
+    @staticmethod
+    def from_company(ticker: str, company) -> FundamentalsPanel:
+        """Panel for one yfinance Ticker object."""
+        return FundamentalsPanel.from_statements({
+            ticker: {
+                "income_stmt": company.income_stmt,
+                "balance_sheet": company.balance_sheet,
+                "cashflow": company.cashflow,
+            }
+        })
+
+    @staticmethod
+    def load(tickers: Iterable[str]) -> FundamentalsPanel:
+        """Panel built from the statements saved under Data/company_data."""
+        statements = {}
+        for ticker in tickers:
+            frames = {}
+            for kind, file_names in STATEMENT_FILES:
+                for file_name in file_names:
+                    try:
+                        frame = read_statement(ticker, file_name)
+                    except FileNotFoundError:
+                        continue
+                    frames[kind] = frame.set_index(frame.columns[0])
+                    break
+            statements[ticker] = frames
+        return FundamentalsPanel.from_statements(statements)
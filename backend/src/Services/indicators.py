@@ -0,0 +1,224 @@
+"""
+Vectorized technical indicators.
+
+Every indicator accepts either a single price Series or a wide DataFrame
+(one column per ticker, indexed by date) and returns full series of the same
+shape, so a whole universe of tickers is computed in one pass.
+"""
+from typing import Dict, Iterable, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from src.Services.market_data import MarketDataService
+
+Prices = Union[pd.Series, pd.DataFrame]
+
+
+def _by_bars(kernel, frames, *args, **kwargs):
+    """
+    Run ``kernel`` over each ticker's own bars.
+
+    In a wide frame a ticker has gaps wherever another market traded and it did
+    not. Each column's present values are packed to the bottom (order kept)
+    before the kernel runs, so windows span trading bars rather than calendar
+    rows, and the results are scattered back to the original dates.
+    """
+    is_series = isinstance(frames[0], pd.Series)
+    name = frames[-1].name if is_series else None
+    frames = [f.to_frame() if is_series else f for f in frames]
+    reference = frames[-1]
+    present = reference.notna().to_numpy()
+    # Missing rows sort first, present rows keep their order at the bottom
+    order = np.argsort(present, axis=0, kind="stable")
+
+    packed = [
+        pd.DataFrame(np.take_along_axis(f.to_numpy(dtype="float64"), order, axis=0), columns=reference.columns)
+        for f in frames
+    ]
+    results = kernel(*packed, *args, **kwargs)
+
+    def unpack(result: pd.DataFrame) -> Prices:
+        values = np.full(result.shape, np.nan)
+        np.put_along_axis(values, order, result.to_numpy(dtype="float64"), axis=0)
+        values[~present] = np.nan
+        frame = pd.DataFrame(values, index=reference.index, columns=reference.columns)
+        return frame.iloc[:, 0].rename(name) if is_series else frame
+
+    if isinstance(results, tuple):
+        return tuple(unpack(r) for r in results)
+    return unpack(results)
+
+
+def _wilder_smooth(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing (RMA) down the rows of a 2-D array.
+
+    Each column is seeded with the simple mean of its first ``period`` valid
+    values, then ``avg = (avg * (period - 1) + x) / period``. Columns may start
+    at different rows; NaNs before a column's first value are skipped.
+    """
+    rows, cols = values.shape
+    out = np.full((rows, cols), np.nan)
+    total = np.zeros(cols)
+    count = np.zeros(cols, dtype=int)
+    avg = np.full(cols, np.nan)
+    for t in range(rows):
+        x = values[t]
+        valid = ~np.isnan(x)
+        seeding = valid & (count < period)
+        total[seeding] += x[seeding]
+        count[valid] += 1
+
+        seeded = seeding & (count == period)
+        avg[seeded] = total[seeded] / period
+        rolling = valid & (count > period)
+        avg[rolling] = (avg[rolling] * (period - 1) + x[rolling]) / period
+
+        ready = valid & (count >= period)
+        out[t, ready] = avg[ready]
+    return out
+
+
+def _rma(frame: pd.DataFrame, period: int) -> pd.DataFrame:
+    return pd.DataFrame(_wilder_smooth(frame.to_numpy(dtype="float64"), period), columns=frame.columns)
+
+
+def _sma(prices: pd.DataFrame, window: int, min_periods: Optional[int] = None) -> pd.DataFrame:
+    return prices.rolling(window, min_periods=min_periods or window).mean()
+
+
+def _ema(prices: pd.DataFrame, span: int) -> pd.DataFrame:
+    return prices.ewm(span=span, adjust=False, min_periods=span).mean()
+
+
+def _rsi(prices: pd.DataFrame, period: int) -> pd.DataFrame:
+    deltas = prices.diff()
+    gains = _rma(deltas.clip(lower=0), period)
+    losses = _rma(-deltas.clip(upper=0), period)
+    rs = gains / losses.replace(0, np.nan)
+    # Gains-only windows have no losses: RSI is 100 rather than undefined
+    return (100 - 100 / (1 + rs)).mask(losses.eq(0) & gains.notna(), 100.0)
+
+
+def _macd(prices: pd.DataFrame, fast: int, slow: int, signal: int):
+    line = _ema(prices, fast) - _ema(prices, slow)
+    signal_line = line.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    return line, signal_line, line - signal_line
+
+
+def _bollinger(prices: pd.DataFrame, window: int, num_std: float):
+    middle = _sma(prices, window)
+    spread = prices.rolling(window).std(ddof=0) * num_std
+    return middle, middle + spread, middle - spread
+
+
+def _true_range(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame) -> pd.DataFrame:
+    previous_close = close.shift(1)
+    # fmax ignores the missing previous close on a ticker's first bar
+    return np.fmax(np.fmax(high - low, (high - previous_close).abs()), (low - previous_close).abs())
+
+
+def _atr(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame, period: int) -> pd.DataFrame:
+    return _rma(_true_range(high, low, close), period)
+
+
+def sma(prices: Prices, window: int, min_periods: Optional[int] = None) -> Prices:
+    """Simple moving average over ``window`` bars."""
+    return _by_bars(_sma, [prices], window, min_periods)
+
+
+def ema(prices: Prices, span: int) -> Prices:
+    """Exponential moving average with the usual ``2 / (span + 1)`` smoothing."""
+    return _by_bars(_ema, [prices], span)
+
+
+def rsi(prices: Prices, period: int = 14) -> Prices:
+    """Wilder's Relative Strength Index (0-100)."""
+    return _by_bars(_rsi, [prices], period)
+
+
+def macd(prices: Prices, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[Prices, Prices, Prices]:
+    """
+    Moving Average Convergence Divergence.
+
+    Returns:
+        Tuple: (macd line, signal line, histogram)
+    """
+    return _by_bars(_macd, [prices], fast, slow, signal)
+
+
+def bollinger_bands(prices: Prices, window: int = 20, num_std: float = 2.0) -> Tuple[Prices, Prices, Prices]:
+    """
+    Bollinger bands around a simple moving average.
+
+    Returns:
+        Tuple: (middle, upper, lower)
+    """
+    return _by_bars(_bollinger, [prices], window, num_std)
+
+
+def atr(high: Prices, low: Prices, close: Prices, period: int = 14) -> Prices:
+    """Wilder's Average True Range."""
+    return _by_bars(_atr, [high, low, close], period)
+
+
+def price_matrix(tickers: Iterable[str], start=None, end=None,
+                 fields: Iterable[str] = ("Open", "High", "Low", "Close", "Volume"),
+                 bars: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Load stored bars for many tickers as one wide frame per field.
+
+    Rows are calendar dates (exchange time zones dropped so markets line up),
+    columns are tickers. Only the local price store is read. ``bars`` keeps
+    just each ticker's most recent bars, whenever its data ends.
+    """
+    store = MarketDataService.store
+    columns = {field: {} for field in fields}
+    for ticker in tickers:
+        history = store.load(ticker, start, end)
+        if bars is not None:
+            history = history.tail(bars)
+        if history.empty:
+            continue
+        index = history.index
+        dates = index.tz_localize(None).normalize() if index.tz is not None else index.normalize()
+        for field in fields:
+            if field in history.columns:
+                columns[field][ticker] = pd.Series(history[field].to_numpy(dtype="float64"), index=dates)
+    return {field: pd.DataFrame(series).sort_index() for field, series in columns.items()}
+
+
+def latest_indicators(close: pd.DataFrame, high: pd.DataFrame = None, low: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Most recent value of the standard indicator set, one row per ticker.
+
+    Args:
+        close (pd.DataFrame): Wide closing prices (dates x tickers)
+        high (pd.DataFrame): Wide highs, needed for ATR
+        low (pd.DataFrame): Wide lows, needed for ATR
+
+    Returns:
+        pd.DataFrame: Indexed by ticker
+    """
+    def last(frame: pd.DataFrame) -> pd.Series:
+        # Last valid value per column, so tickers with older last bars still count
+        return frame.ffill().iloc[-1] if len(frame) else pd.Series(np.nan, index=frame.columns)
+
+    macd_line, signal_line, histogram = macd(close)
+    middle, upper, lower = bollinger_bands(close)
+    result = pd.DataFrame({
+        "close": last(close),
+        "sma_50": last(sma(close, 50)),
+        "sma_200": last(sma(close, 200)),
+        "ema_20": last(ema(close, 20)),
+        "rsi_14": last(rsi(close)),
+        "macd": last(macd_line),
+        "macd_signal": last(signal_line),
+        "macd_hist": last(histogram),
+        "bb_middle": last(middle),
+        "bb_upper": last(upper),
+        "bb_lower": last(lower),
+    })
+    if high is not None and low is not None:
+        result["atr_14"] = last(atr(high.reindex_like(close), low.reindex_like(close), close))
+    result.index.name = "ticker"
+    return result
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import time
+import traceback
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job queue already holds its maximum number of pending jobs."""
+
+
+@dataclass
+class Job:
+    job_id: str
+    kind: str
+    key: str
+    status: str = "queued"  # queued -> running -> succeeded | failed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Status fields, without the (possibly large) result."""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "key": self.key,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue.
+
+    Jobs are coroutines run by a fixed number of asyncio workers, so long
+    generations never hold an HTTP request open. A job submitted while another
+    one with the same key is still queued or running is answered with the
+    existing job. Finished jobs are kept for ``result_ttl`` seconds.
+    """
+
+    def __init__(self, kind: str, workers: int = None, max_queued: int = None, result_ttl: float = None):
+        self.kind = kind
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.max_queued = max_queued or int(os.getenv("JOB_QUEUE_SIZE", "100"))
+        self.result_ttl = result_ttl or float(os.getenv("JOB_RESULT_TTL", "3600"))
+        self._jobs: Dict[str, Job] = {}
+        self._active: Dict[str, str] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop = None
+
+    def start(self) -> None:
+        """Start the workers on the running event loop (no-op if already running there)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def submit(self, key: str, func: Callable[..., Awaitable[Any]], *args) -> Job:
+        """
+        Enqueue ``func(*args)``.
+
+        Args:
+            key (str): Identifies the work, e.g. the ticker
+            func: Coroutine function producing the job's result
+
+        Returns:
+            Job: The new job, or the pending one with the same key
+
+        Raises:
+            JobQueueFullError: If the queue is full
+        """
+        self.start()
+        self._prune()
+
+        active_id = self._active.get(key)
+        if active_id is not None and not self._jobs[active_id].done:
+            return self._jobs[active_id]
+
+        job = Job(job_id=uuid.uuid4().hex, kind=self.kind, key=key)
+        try:
+            self._queue.put_nowait((job, func, args))
+        except asyncio.QueueFull:
+            raise JobQueueFullError(f"Too many pending {self.kind} jobs, try again shortly")
+        self._jobs[job.job_id] = job
+        self._active[key] = job.job_id
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        counts = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return counts
+
+    async def _worker(self) -> None:
+        while True:
+            job, func, args = await self._queue.get()
+            job.status, job.started_at = "running", time.time()
+            try:
+                job.result = await func(*args)
+                job.status = "succeeded"
+            except asyncio.CancelledError:
+                job.status, job.error = "failed", "Cancelled"
+                raise
+            except Exception as e:
+                print(f"Error running {self.kind} job {job.job_id}: {str(e)}")
+                print(f"Traceback: {traceback.format_exc()}")
+                job.status, job.error = "failed", str(e)
+            finally:
+                job.finished_at = time.time()
+                if self._active.get(job.key) == job.job_id:
+                    del self._active[job.key]
+                self._queue.task_done()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.done and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
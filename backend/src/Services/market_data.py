@@ -0,0 +1,72 @@
+import yfinance as yf
+import pandas as pd
+from typing import Dict
+from datetime import datetime, timedelta
+from Data.price_store import PriceStore
+
+class MarketDataService:
+    """Serves price history from the local columnar store, topping it up from yfinance when needed."""
+
+    store = PriceStore()
+
+    # Bars are considered current if the last one is at most this old (weekends, holidays)
+    STALE_AFTER = timedelta(days=4)
+    # Minimum gap between two refresh attempts for the same ticker
+    REFRESH_INTERVAL = timedelta(hours=1)
+    _last_refresh: Dict[str, datetime] = {}
+
+    @staticmethod
+    def get_history(ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Get OHLCV bars for a ticker in ``[start, end)``.
+
+        Args:
+            ticker (str): Company stock ticker symbol
+            start (datetime): Start of the window
+            end (datetime): End of the window (exclusive)
+
+        Returns:
+            pd.DataFrame: Bars read from the price store
+        """
+        store = MarketDataService.store
+        try:
+            MarketDataService._ensure_coverage(ticker, start, end)
+        except Exception as e:
+            print(f"Error refreshing price history for {ticker}: {str(e)}")
+        return store.load(ticker, start, end)
+
+    @staticmethod
+    def _ensure_coverage(ticker: str, start: datetime, end: datetime) -> None:
+        store = MarketDataService.store
+        now = datetime.now()
+        last_refresh = MarketDataService._last_refresh.get(ticker)
+        if last_refresh and now - last_refresh < MarketDataService.REFRESH_INTERVAL:
+            return
+
+        # (start, end, reaches back to the requested start) ranges to request from yfinance
+        ranges = []
+        if not store.has(ticker):
+            ranges.append((start, end, True))
+        else:
+            first = store.first_timestamp(ticker)
+            last = store.last_timestamp(ticker)
+            covered = store.covered_from(ticker)
+            # Requested window reaches further back than what is stored, and yfinance
+            # has not already been asked for that range (it comes back empty before listing)
+            if (first is not None
+                    and first.tz_localize(None) - pd.Timestamp(start) > MarketDataService.STALE_AFTER
+                    and (covered is None or covered.tz_localize(None) - pd.Timestamp(start) > MarketDataService.STALE_AFTER)):
+                ranges.append((start, first.tz_localize(None).to_pydatetime(), True))
+            if last is None or pd.Timestamp(end) - last.tz_localize(None) > MarketDataService.STALE_AFTER:
+                fetch_start = start if last is None else last.tz_localize(None).to_pydatetime() + timedelta(days=1)
+                ranges.append((fetch_start, end, last is None))
+        if not ranges:
+            return
+
+        MarketDataService._last_refresh[ticker] = now
+        for fetch_start, fetch_end, reaches_start in ranges:
+            bars = yf.Ticker(ticker).history(start=fetch_start, end=fetch_end)
+            if not bars.empty:
+                store.merge(ticker, bars)
+            if reaches_start:
+                store.mark_covered_from(ticker, fetch_start)
@@ -0,0 +1,124 @@
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "has",
+    "have", "how", "i", "in", "is", "it", "its", "me", "my", "of", "on", "or", "our", "so", "that",
+    "the", "their", "this", "to", "was", "what", "when", "which", "why", "will", "with", "you",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def chunk_text(text: str, max_chars: int = 800) -> List[str]:
+    """
+    Split a markdown analysis into chunks of whole paragraphs of at most ``max_chars``.
+
+    Each chunk is prefixed with the nearest preceding heading so it still
+    makes sense on its own.
+    """
+    chunks, current, heading = [], "", ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if paragraph.startswith("#"):
+            heading = paragraph.splitlines()[0]
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            chunks.append(current)
+            current = heading if heading and not paragraph.startswith("#") else ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of (source, text) chunks."""
+
+    def __init__(self, chunks: List[Tuple[str, str]], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [Counter(tokenize(text)) for _, text in chunks]
+        self._lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+        document_freq = Counter()
+        for tf in self._term_freqs:
+            document_freq.update(tf.keys())
+        n = len(chunks)
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in document_freq.items()
+        }
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[str, str, float]]:
+        """Return up to ``k`` (source, text, score) tuples, best first; ties keep document order."""
+        terms = [t for t in set(tokenize(query)) if t in self._idf]
+        scores = []
+        for i, tf in enumerate(self._term_freqs):
+            norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / (self._avg_length or 1.0))
+            score = 0.0
+            for term in terms:
+                freq = tf.get(term)
+                if freq:
+                    score += self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(score)
+
+        ranked = sorted(range(len(scores)), key=lambda i: -scores[i])[:k]
+        return [(self.chunks[i][0], self.chunks[i][1], scores[i]) for i in ranked]
+
+
+class RetrievalService:
+    """Per-company BM25 indexes over chunked analysis files, rebuilt only when a file changes."""
+
+    _indexes: Dict[str, Tuple[tuple, BM25Index]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _version(paths: Dict[str, str]) -> tuple:
+        version = []
+        for source, path in sorted(paths.items()):
+            try:
+                stat = os.stat(path)
+                version.append((source, path, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append((source, path, None, None))
+        return tuple(version)
+
+    @staticmethod
+    def get_index(company: str, paths: Dict[str, str]) -> BM25Index:
+        """
+        Get the index for a company's analyses.
+
+        Args:
+            company (str): Company ticker symbol
+            paths (Dict[str, str]): Analysis type -> file path
+
+        Returns:
+            BM25Index: Index over the chunks of every existing file
+        """
+        version = RetrievalService._version(paths)
+        cached = RetrievalService._indexes.get(company)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        chunks = []
+        for source, path in paths.items():
+            try:
+                with open(path, "r") as file:
+                    chunks.extend((source, chunk) for chunk in chunk_text(file.read()))
+            except FileNotFoundError:
+                print(f"Warning: {path} not found")
+
+        index = BM25Index(chunks)
+        with RetrievalService._lock:
+            RetrievalService._indexes[company] = (version, index)
+        return index
@@ -0,0 +1,306 @@
+import ast
+import operator
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from Data.price_store import COMPANY_DATA_DIR
+from Prompts.statements import read_statement
+from src.Services import indicators
+from src.Services.fundamentals import FundamentalsService
+from src.Services.market_data import MarketDataService
+
+
+class ScreenExpressionError(ValueError):
+    """Raised for filter or sort expressions that are invalid or not allowed."""
+
+
+# Screen column -> company_info.csv key
+FUNDAMENTALS = {
+    "pe": "trailingPE",
+    "forward_pe": "forwardPE",
+    "price_to_book": "priceToBook",
+    "debt_to_equity": "debtToEquity",
+    "market_cap": "marketCap",
+    "profit_margin": "profitMargins",
+    "roe": "returnOnEquity",
+    "dividend_yield": "dividendYield",
+    "beta": "beta",
+}
+TEXT_FIELDS = {
+    "sector": "sector",
+    "industry": "industry",
+    "currency": "currency",
+}
+# Ratios of the latest fiscal year from the normalized statements (see fundamentals.py)
+STATEMENT_RATIOS = [
+    "revenue_growth", "net_income_growth", "gross_margin", "operating_margin", "net_margin",
+    "fcf_margin", "free_cash_flow", "current_ratio",
+]
+# Latest indicator values per ticker (see indicators.latest_indicators)
+TECHNICALS = [
+    "close", "sma_50", "sma_200", "ema_20", "rsi_14", "macd", "macd_signal", "macd_hist",
+    "bb_middle", "bb_upper", "bb_lower", "atr_14", "ma_crossover", "golden_cross",
+]
+
+MAX_EXPRESSION_LENGTH = 1000
+
+_COMPARE = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_ARITHMETIC = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+def _truthy(value) -> pd.Series:
+    if isinstance(value, pd.Series):
+        return value.fillna(False).astype(bool) if value.dtype == object else value.fillna(0).astype(bool)
+    return value
+
+
+def evaluate(expression: str, metrics: pd.DataFrame):
+    """
+    Evaluate a screen expression column-wise over ``metrics``.
+
+    Only metric names, numbers/strings/booleans, arithmetic, comparisons
+    (including chained ones), ``and``/``or``/``not`` and ``in``/``not in`` a
+    list of constants are allowed, e.g.
+    ``pe < 25 and debt_to_equity < 50 and sector in ["Technology"]``.
+
+    Raises:
+        ScreenExpressionError: If the expression does not parse or uses
+            anything outside that whitelist
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ScreenExpressionError("Expression is too long")
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ScreenExpressionError(f"Invalid expression '{expression}': {e.msg}")
+
+    def visit(node):
+        if isinstance(node, ast.Expression):
+            return visit(node.body)
+        if isinstance(node, ast.Name):
+            if node.id not in metrics.columns:
+                raise ScreenExpressionError(f"Unknown metric '{node.id}'")
+            return metrics[node.id]
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool)):
+            return node.value
+        if isinstance(node, ast.BoolOp):
+            values = [_truthy(visit(v)) for v in node.values]
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            result = values[0]
+            for value in values[1:]:
+                result = combine(result, value)
+            return result
+        if isinstance(node, ast.UnaryOp):
+            operand = visit(node.operand)
+            if isinstance(node.op, ast.Not):
+                return ~_truthy(operand) if isinstance(operand, pd.Series) else not operand
+            if isinstance(node.op, ast.USub):
+                return -operand
+            if isinstance(node.op, ast.UAdd):
+                return operand
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            return _ARITHMETIC[type(node.op)](visit(node.left), visit(node.right))
+        if isinstance(node, ast.Compare):
+            result, left = True, visit(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    if not isinstance(comparator, (ast.List, ast.Tuple)):
+                        raise ScreenExpressionError("'in' needs a list of constants")
+                    choices = [visit(item) for item in comparator.elts]
+                    matched = left.isin(choices) if isinstance(left, pd.Series) else left in choices
+                    step = ~matched if isinstance(op, ast.NotIn) else matched
+                    right = None
+                elif type(op) in _COMPARE:
+                    right = visit(comparator)
+                    step = _COMPARE[type(op)](left, right)
+                else:
+                    raise ScreenExpressionError(f"Operator '{type(op).__name__}' is not allowed")
+                result = operator.and_(result, step) if result is not True else step
+                left = right
+            return result
+        raise ScreenExpressionError(f"'{type(node).__name__}' is not allowed in screen expressions")
+
+    try:
+        return visit(tree)
+    except TypeError as e:
+        # e.g. comparing a text field with a number
+        raise ScreenExpressionError(f"Invalid expression '{expression}': {str(e)}")
+
+
+class ScreenerService:
+    """
+    Cross-sectional screens over the whole ticker universe.
+
+    Fundamentals from company_info.csv and the latest technical indicators are
+    kept in one in-memory frame (one row per ticker, one column per metric),
+    rebuilt when the underlying files change, so a screen is a handful of
+    vectorized column operations.
+    """
+
+    # How often the universe is checked for changed files
+    REFRESH_INTERVAL = float(os.getenv("SCREEN_REFRESH_INTERVAL", "60"))
+    # Enough daily bars for a 200-day average and its recent crossovers
+    PRICE_BARS = 260
+    # A 50/200 crossover counts as recent within this many bars
+    CROSSOVER_BARS = 10
+
+    _metrics: Optional[pd.DataFrame] = None
+    _signature = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _universe() -> List[str]:
+        store = MarketDataService.store
+        with_info = []
+        if os.path.isdir(COMPANY_DATA_DIR):
+            with_info = [
+                name for name in os.listdir(COMPANY_DATA_DIR)
+                if os.path.exists(os.path.join(COMPANY_DATA_DIR, name, "company_info.csv"))
+            ]
+        return sorted(set(store.tickers()) | set(with_info))
+
+    @staticmethod
+    def _universe_signature(tickers: List[str]) -> tuple:
+        """
+        One price store version and one folder mtime per ticker.
+
+        Ingestion replaces statement CSVs and company_info.csv by renaming a
+        temporary file into the ticker's folder, which bumps the folder's mtime,
+        so the check costs two stats per ticker however many files it holds.
+        """
+        store = MarketDataService.store
+        signature = []
+        for ticker in tickers:
+            try:
+                folder_mtime = os.stat(os.path.join(COMPANY_DATA_DIR, ticker)).st_mtime_ns
+            except OSError:
+                folder_mtime = None
+            signature.append((store.version(ticker), folder_mtime))
+        return tuple(tickers), tuple(signature)
+
+    @staticmethod
+    def _fundamentals(tickers: List[str]) -> pd.DataFrame:
+        rows = {}
+        for ticker in tickers:
+            try:
+                info = read_statement(ticker, "company_info.csv")
+            except FileNotFoundError:
+                continue
+            rows[ticker] = pd.Series(info.iloc[:, 1].to_numpy(), index=info.iloc[:, 0].to_numpy())
+
+        frame = pd.DataFrame(rows).T.reindex(tickers)
+        result = pd.DataFrame(index=pd.Index(tickers, name="ticker"))
+        for column, key in FUNDAMENTALS.items():
+            values = frame[key] if key in frame.columns else np.nan
+            result[column] = pd.to_numeric(values, errors="coerce")
+        for column, key in TEXT_FIELDS.items():
+            result[column] = frame[key] if key in frame.columns else None
+        return result
+
+    @staticmethod
+    def _technicals(tickers: List[str]) -> pd.DataFrame:
+        matrix = indicators.price_matrix(tickers, fields=("High", "Low", "Close"), bars=ScreenerService.PRICE_BARS)
+        close = matrix["Close"]
+        if close.empty:
+            return pd.DataFrame(columns=TECHNICALS, index=pd.Index([], name="ticker"), dtype="float64")
+
+        technical = indicators.latest_indicators(close, matrix["High"], matrix["Low"])
+
+        # +1: 50-day crossed above 200-day recently, -1: crossed below, 0: no recent cross
+        side = np.sign(indicators.sma(close, 50) - indicators.sma(close, 200)).ffill()
+        changes = side.tail(ScreenerService.CROSSOVER_BARS + 1).diff().replace(0, np.nan)
+        last_change = changes.ffill().iloc[-1] if len(changes) else pd.Series(np.nan, index=close.columns)
+        technical["ma_crossover"] = np.sign(last_change).fillna(0).astype(int)
+        technical["golden_cross"] = technical["sma_50"] > technical["sma_200"]
+        return technical.reindex(columns=TECHNICALS)
+
+    @staticmethod
+    def _build(tickers: List[str]) -> pd.DataFrame:
+        statements = FundamentalsService.load(tickers).to_frame()[STATEMENT_RATIOS]
+        metrics = (
+            ScreenerService._fundamentals(tickers)
+            .join(statements, how="left")
+            .join(ScreenerService._technicals(tickers), how="left")
+        )
+        metrics.index.name = "ticker"
+        return metrics
+
+    @staticmethod
+    def metrics() -> pd.DataFrame:
+        """The current metrics frame, rebuilt if any ticker's files changed."""
+        now = time.time()
+        with ScreenerService._lock:
+            if ScreenerService._metrics is not None and now - ScreenerService._checked_at < ScreenerService.REFRESH_INTERVAL:
+                return ScreenerService._metrics
+
+        # Checking for changes does not need the lock; only a rebuild does
+        tickers = ScreenerService._universe()
+        signature = ScreenerService._universe_signature(tickers)
+        with ScreenerService._lock:
+            if ScreenerService._metrics is None or signature != ScreenerService._signature:
+                ScreenerService._metrics = ScreenerService._build(tickers)
+                ScreenerService._signature = signature
+            ScreenerService._checked_at = now
+            return ScreenerService._metrics
+
+    @staticmethod
+    def screen(filter_expression: str = "", sort: Optional[str] = None, limit: int = 50,
+               fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Filter, sort and truncate the ticker universe.
+
+        Args:
+            filter_expression (str): Boolean screen expression; empty keeps every ticker
+            sort (str): Expression to sort by, ascending; negate it (``-market_cap``) for descending
+            limit (int): Maximum number of rows returned
+            fields (List[str]): Metric columns to include; all when omitted
+
+        Returns:
+            Dict with the number of matches and the selected rows
+
+        Raises:
+            ScreenExpressionError: For invalid expressions or unknown fields
+        """
+        metrics = ScreenerService.metrics()
+
+        selected = metrics
+        if filter_expression and filter_expression.strip():
+            mask = evaluate(filter_expression, metrics)
+            if not isinstance(mask, pd.Series):
+                raise ScreenExpressionError("Filter must reference at least one metric")
+            selected = metrics[_truthy(mask)]
+
+        if sort:
+            key = evaluate(sort, selected)
+            if not isinstance(key, pd.Series):
+                raise ScreenExpressionError("Sort must reference at least one metric")
+            order = np.argsort(pd.to_numeric(key, errors="coerce").fillna(np.inf).to_numpy(), kind="stable")
+            selected = selected.iloc[order]
+
+        if fields:
+            unknown = [f for f in fields if f not in metrics.columns]
+            if unknown:
+                raise ScreenExpressionError(f"Unknown fields: {', '.join(unknown)}")
+            selected = selected[fields]
+
+        rows = selected.head(limit).astype(object).where(selected.head(limit).notna(), None)
+        return {
+            "matches": int(len(selected)),
+            "results": [{"ticker": ticker, **row} for ticker, row in rows.to_dict(orient="index").items()],
+        }
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one computation.
+
+    The first caller for a key starts ``func(*args)``; callers arriving while
+    it is in flight await the same task instead of starting their own. A
+    successful result is also handed to later callers for ``share_ttl``
+    seconds (0 shares only while in flight). Errors are passed to every
+    waiting caller but never shared afterwards. A caller that is cancelled,
+    e.g. because its client disconnected, stops waiting without cancelling
+    the work the others are waiting on.
+    """
+
+    def __init__(self, name: str, share_ttl: float = None):
+        self.name = name
+        self.share_ttl = float(os.getenv("SINGLEFLIGHT_SHARE_TTL", "0")) if share_ttl is None else share_ttl
+        self._inflight: Dict[Hashable, Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args) -> Any:
+        """
+        Run ``func(*args)`` once for all concurrent callers with ``key``.
+
+        Returns:
+            The shared result of the computation
+        """
+        shared = self._results.get(key)
+        if shared is not None:
+            if time.monotonic() - shared[0] < self.share_ttl:
+                return shared[1]
+            del self._results[key]
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        # A task left behind by another (e.g. closed) event loop cannot be awaited here
+        if inflight is None or inflight[0] is not loop or inflight[1].done():
+            task = loop.create_task(func(*args))
+            self._inflight[key] = (loop, task)
+            task.add_done_callback(lambda finished: self._finish(key, finished))
+        else:
+            task = inflight[1]
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable) -> None:
+        """Drop a shared result so the next call recomputes it."""
+        self._results.pop(key, None)
+
+    def in_flight(self) -> int:
+        return sum(1 for _, task in self._inflight.values() if not task.done())
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key, (None, None))[1] is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            print(f"Error in shared {self.name} call for {key}: {str(error)}")
+            return
+        if self.share_ttl > 0:
+            now = time.monotonic()
+            expired = [k for k, (finished_at, _) in self._results.items() if now - finished_at >= self.share_ttl]
+            for k in expired:
+                del self._results[k]
+            self._results[key] = (now, task.result())
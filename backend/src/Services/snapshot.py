@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import pandas as pd
+import yfinance as yf
+from src.Services.market_data import MarketDataService
+from src.Services.singleflight import SingleFlight
+
+
+@dataclass(frozen=True)
+class TickerSnapshot:
+    """
+    Everything the charts need for one ticker, loaded once.
+
+    Snapshots are shared between requests and must be treated as read-only;
+    consumers derive new frames instead of modifying ``history`` or
+    ``income_stmt`` in place.
+    """
+    ticker: str
+    years: float
+    history: pd.DataFrame
+    income_stmt: pd.DataFrame
+    loaded_at: float
+
+
+class SnapshotService:
+    """Loads ticker snapshots off the event loop and keeps recent ones for ``TTL`` seconds."""
+
+    TTL = float(os.getenv("SNAPSHOT_TTL", "300"))
+    MAX_SNAPSHOTS = int(os.getenv("SNAPSHOT_MAX_ITEMS", "128"))
+
+    _snapshots: "OrderedDict[tuple, TickerSnapshot]" = OrderedDict()
+    _lock = threading.Lock()
+    # The snapshot cache above shares finished loads; this only joins concurrent ones
+    _flight = SingleFlight("snapshot", share_ttl=0)
+
+    @staticmethod
+    async def get(ticker: str, years: float = 3) -> TickerSnapshot:
+        """
+        Get a snapshot of a ticker's price history and income statement.
+
+        Args:
+            ticker (str): Company stock ticker symbol
+            years (float): Length of the price history window
+
+        Returns:
+            TickerSnapshot: Cached snapshot, or a freshly loaded one
+        """
+        key = (ticker, years)
+        with SnapshotService._lock:
+            snapshot = SnapshotService._snapshots.get(key)
+            if snapshot is not None and time.time() - snapshot.loaded_at < SnapshotService.TTL:
+                SnapshotService._snapshots.move_to_end(key)
+                return snapshot
+
+        # A cold ticker requested by many clients at once is fetched only once
+        return await SnapshotService._flight.do(key, SnapshotService._load, ticker, years)
+
+    @staticmethod
+    async def _load(ticker: str, years: float) -> TickerSnapshot:
+        key = (ticker, years)
+        # Prices and statements come from different sources; fetch them side by side
+        loop = asyncio.get_running_loop()
+        history, income_stmt = await asyncio.gather(
+            loop.run_in_executor(None, SnapshotService._load_history, ticker, years),
+            loop.run_in_executor(None, SnapshotService._load_income_stmt, ticker),
+        )
+        snapshot = TickerSnapshot(ticker, years, history, income_stmt, time.time())
+
+        with SnapshotService._lock:
+            SnapshotService._snapshots[key] = snapshot
+            SnapshotService._snapshots.move_to_end(key)
+            while len(SnapshotService._snapshots) > SnapshotService.MAX_SNAPSHOTS:
+                SnapshotService._snapshots.popitem(last=False)
+        return snapshot
+
+    @staticmethod
+    def _load_history(ticker: str, years: float) -> pd.DataFrame:
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=int(years*365))
+        try:
+            return MarketDataService.get_history(ticker, start_date, end_date)
+        except Exception as e:
+            print(f"Error loading price history for {ticker}: {str(e)}")
+            return pd.DataFrame()
+
+    @staticmethod
+    def _load_income_stmt(ticker: str) -> pd.DataFrame:
+        try:
+            income_stmt = yf.Ticker(ticker).income_stmt
+        except Exception as e:
+            print(f"Error loading income statement for {ticker}: {str(e)}")
+            return pd.DataFrame()
+        return income_stmt if income_stmt is not None else pd.DataFrame()
+
+    @staticmethod
+    def clear() -> None:
+        with SnapshotService._lock:
+            SnapshotService._snapshots.clear()
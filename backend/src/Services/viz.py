@@ -1,38 +1,148 @@
-import yfinance as yf
+import asyncio
 import plotly.graph_objects as go
 import plotly.express as px
-import plotly.io as pio
 from typing import Dict, Any
-from datetime import datetime, timedelta
 import base64
+import json
 import traceback
+from src.Services.snapshot import SnapshotService, TickerSnapshot
+from src.Services.chart_renderer import ChartRenderer, RendererBusyError
+from src.Services.chart_cache import chart_cache
+from src.Services.downsample import resample_ohlc, downsample_series
+from src.Services import indicators
+from src.Services.fundamentals import line_item
+from src.Services.singleflight import SingleFlight
+
+# Rendered charts are cached separately, so results are only shared while in flight by default
+viz_flight = SingleFlight("visualize")
 
 class VisualizationService:
+    # Everything besides the data and output format that determines a rendered chart
+    CHART_LAYOUT = {"height": 500, "scale": 2, "template": "plotly_dark"}
+    DEFAULT_WIDTH = 800
+    # png: base64 data URI, svg: SVG markup, json: plotly figure JSON for client-side rendering
+    FORMATS = ("png", "svg", "json")
+    CHARTS = ("stock_price", "revenue_growth", "profitability")
+    # Moving averages drawn over the candlesticks
+    PRICE_OVERLAYS = (50, 200)
+
+    @staticmethod
+    def _layout(image_format: str, width: int) -> Dict[str, Any]:
+        return {**VisualizationService.CHART_LAYOUT, "format": image_format, "width": width}
+
+    @staticmethod
+    async def _export_figure(fig, image_format: str = "png", width: int = DEFAULT_WIDTH) -> Any:
+        """Export a figure in the requested format"""
+        if image_format == "json":
+            fig.update_layout(width=width, height=500)
+            return json.loads(fig.to_json())
+        if image_format == "svg":
+            try:
+                fig.update_layout(width=width, height=500)
+                svg_bytes = await ChartRenderer.render(fig, image_format="svg", scale=1)
+                return svg_bytes.decode("utf-8")
+            except RendererBusyError:
+                raise
+            except Exception as e:
+                print(f"Error exporting SVG: {str(e)}")
+                return ""
+        return await VisualizationService._convert_fig_to_base64(fig, width)
+
+    @staticmethod
+    async def _render_cached(cache_key: str, fig, image_format: str = "png", width: int = DEFAULT_WIDTH) -> Any:
+        """Render a figure and remember the result under its data fingerprint."""
+        image = await VisualizationService._export_figure(fig, image_format, width)
+        if image:
+            await chart_cache.put_async(cache_key, image)
+        return image
+
+    @staticmethod
+    async def get_stock_visualizations(ticker: str, image_format: str = "png",
+                                       width: int = DEFAULT_WIDTH, years: float = 3) -> Dict[str, Any]:
+        """
+        Generate interactive visualizations for company financials
+
+        ``width`` is the target chart width in pixels; long price histories are
+        resampled to coarser bars so the point count follows the width. The
+        ticker's data is loaded once and the charts are built concurrently.
+        """
+        if image_format not in VisualizationService.FORMATS:
+            raise ValueError(f"Unsupported format '{image_format}'")
+        # Identical requests arriving together share one build
+        return await viz_flight.do(
+            ("all", ticker, image_format, width, years),
+            VisualizationService._get_stock_visualizations, ticker, image_format, width, years
+        )
+
     @staticmethod
-    async def get_stock_visualizations(ticker: str) -> Dict[str, Any]:
-        """Generate interactive visualizations for company financials"""
+    async def _get_stock_visualizations(ticker: str, image_format: str, width: int, years: float) -> Dict[str, Any]:
         try:
-            company = yf.Ticker(ticker)
+            snapshot = await SnapshotService.get(ticker, years)
             
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=3*365)
-            stock_data = company.history(start=start_date, end=end_date)
-            
-            visualizations = {
-                "stock_price": await VisualizationService._create_stock_chart(stock_data, ticker),
-                "revenue_growth": await VisualizationService._create_revenue_chart(company),
-                "profitability": await VisualizationService._create_profitability_chart(company)
-            }
+            charts = await asyncio.gather(*(
+                VisualizationService._build_chart(chart, snapshot, image_format, width)
+                for chart in VisualizationService.CHARTS
+            ))
+            visualizations = dict(zip(VisualizationService.CHARTS, charts))
             
             return visualizations
             
+        except RendererBusyError:
+            raise
         except Exception as e:
             print(f"Error generating visualizations: {str(e)}")
             print(f"Traceback: {traceback.format_exc()}")
             return {}
 
     @staticmethod
-    async def _convert_fig_to_base64(fig) -> str:
+    async def get_chart(ticker: str, chart: str, image_format: str = "png",
+                        width: int = DEFAULT_WIDTH, years: float = 3) -> Any:
+        """
+        Generate a single visualization
+
+        Args:
+            ticker (str): Company stock ticker symbol
+            chart (str): One of ``CHARTS``
+            image_format (str): One of ``FORMATS``
+            width (int): Chart width in pixels
+            years (float): Length of the price history window
+
+        Returns:
+            Any: The chart in the requested format, or "" if it could not be built
+        """
+        if chart not in VisualizationService.CHARTS:
+            raise ValueError(f"Unknown chart '{chart}'")
+        if image_format not in VisualizationService.FORMATS:
+            raise ValueError(f"Unsupported format '{image_format}'")
+
+        return await viz_flight.do(
+            (chart, ticker, image_format, width, years),
+            VisualizationService._get_chart, ticker, chart, image_format, width, years
+        )
+
+    @staticmethod
+    async def _get_chart(ticker: str, chart: str, image_format: str, width: int, years: float) -> Any:
+        # Charts requested one by one for the same page share the cached snapshot
+        snapshot = await SnapshotService.get(ticker, years)
+        return await VisualizationService._build_chart(chart, snapshot, image_format, width)
+
+    @staticmethod
+    async def _build_chart(chart: str, snapshot: TickerSnapshot, image_format: str, width: int) -> Any:
+        builders = {
+            "stock_price": VisualizationService._create_stock_chart,
+            "revenue_growth": VisualizationService._create_revenue_chart,
+            "profitability": VisualizationService._create_profitability_chart,
+        }
+        return await builders[chart](snapshot, image_format, width)
+
+    @staticmethod
+    async def _in_thread(func, *args):
+        """Run figure construction on the default thread pool so charts build in parallel."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    @staticmethod
+    async def _convert_fig_to_base64(fig, width: int = DEFAULT_WIDTH) -> str:
         """Convert plotly figure to base64 string"""
         try:
             # Ensure figure has layout
@@ -40,164 +150,212 @@ class VisualizationService:
                 fig.layout = go.Layout()
             
             # Set static image size
-            fig.update_layout(width=800, height=500)
-            
-            # Attempt to configure renderer if kaleido is available
-            try:
-                import kaleido
-                pio.kaleido.scope.mathjax = None
-            except ImportError:
-                print("Kaleido not available. Using default rendering.")
+            fig.update_layout(width=width, height=500)
             
-            # Convert to image with higher quality
-            img_bytes = pio.to_image(fig, format="png", scale=2)
+            # Rasterize in the renderer pool so the event loop stays free
+            img_bytes = await ChartRenderer.render(fig, image_format="png", scale=2)
             
             # Convert to base64
             base64_string = base64.b64encode(img_bytes).decode('utf-8')
             return f"data:image/png;base64,{base64_string}"
+        except RendererBusyError:
+            raise
         except Exception as e:
             print(f"Error in _convert_fig_to_base64: {str(e)}")
             print(f"Traceback: {traceback.format_exc()}")
             return ""
 
     @staticmethod
-    async def _create_stock_chart(stock_data, ticker: str) -> str:
+    async def _create_stock_chart(snapshot: TickerSnapshot, image_format: str = "png",
+                                  width: int = DEFAULT_WIDTH) -> Any:
         """Create stock price chart"""
         try:
+            ticker = snapshot.ticker
+            stock_data = snapshot.history
+            
             # Check if stock_data is empty
             if stock_data.empty:
                 print(f"No stock data available for {ticker}")
                 return ""
             
-            fig = go.Figure(data=[
-                go.Candlestick(
-                    x=stock_data.index,
-                    high=stock_data['High'],
-                    low=stock_data['Low'],
-                    open=stock_data['Open'],
-                    close=stock_data['Close'],
-                    name='Stock Price'
-                )
-            ])
-            
-            fig.update_layout(
-                title=f"{ticker} Stock Price Movement",
-                yaxis_title="Price",
-                xaxis_title="Date",
-                template="plotly_dark",
-                width=800,
-                height=500
+            cache_key = chart_cache.fingerprint(
+                ticker, "stock_price", stock_data[['Open', 'High', 'Low', 'Close']],
+                {**VisualizationService._layout(image_format, width),
+                 "sma": list(VisualizationService.PRICE_OVERLAYS)}
             )
+            cached = await chart_cache.get_async(cache_key)
+            if cached is not None:
+                return cached
             
-            return await VisualizationService._convert_fig_to_base64(fig)
+            fig = await VisualizationService._in_thread(
+                VisualizationService._stock_figure, stock_data, ticker, width
+            )
+            return await VisualizationService._render_cached(cache_key, fig, image_format, width)
+        except RendererBusyError:
+            raise
         except Exception as e:
             print(f"Error creating stock chart: {str(e)}")
             print(f"Traceback: {traceback.format_exc()}")
             return ""
 
     @staticmethod
-    async def _create_revenue_chart(company) -> str:
+    def _stock_figure(stock_data, ticker: str, width: int):
+        # Daily bars become weekly/monthly once they outnumber the pixels
+        bars = resample_ohlc(stock_data, width)
+        
+        fig = go.Figure(data=[
+            go.Candlestick(
+                x=bars.index,
+                high=bars['High'],
+                low=bars['Low'],
+                open=bars['Open'],
+                close=bars['Close'],
+                name='Stock Price'
+            )
+        ])
+        
+        # Averages come from the daily closes, then get thinned like any other line
+        for window in VisualizationService.PRICE_OVERLAYS:
+            average = downsample_series(indicators.sma(stock_data['Close'], window), width)
+            if not average.empty:
+                fig.add_trace(go.Scatter(
+                    x=average.index,
+                    y=average.values,
+                    mode='lines',
+                    name=f"{window}-Day MA"
+                ))
+        
+        fig.update_layout(
+            title=f"{ticker} Stock Price Movement",
+            yaxis_title="Price",
+            xaxis_title="Date",
+            template="plotly_dark",
+            width=width,
+            height=500
+        )
+        return fig
+
+    @staticmethod
+    async def _create_revenue_chart(snapshot: TickerSnapshot, image_format: str = "png",
+                                    width: int = DEFAULT_WIDTH) -> Any:
         """Create revenue trend visualization"""
         try:
+            income_stmt = snapshot.income_stmt
+            
             # Check if income statement exists
-            if company.income_stmt is None or company.income_stmt.empty:
+            if income_stmt.empty:
                 print("No income statement data available")
                 return ""
             
-            # Find revenue column
-            revenue_columns = ['Total Revenue', 'Revenues', 'Revenue']
-            revenue_data = None
-            
-            for col in revenue_columns:
-                if col in company.income_stmt.index:
-                    revenue_data = company.income_stmt.loc[col]
-                    break
+            # Find revenue row under any of its aliases
+            revenue_data = line_item(income_stmt, "revenue")
             
             # If no revenue data found
             if revenue_data is None or revenue_data.empty:
                 print("No revenue data found")
                 return ""
             
-            # Create figure
-            fig = px.line(
-                x=revenue_data.index,
-                y=revenue_data.values,
-                title="Revenue Growth Trend"
+            cache_key = chart_cache.fingerprint(
+                snapshot.ticker, "revenue_growth", revenue_data, VisualizationService._layout(image_format, width)
             )
+            cached = await chart_cache.get_async(cache_key)
+            if cached is not None:
+                return cached
             
-            fig.update_layout(
-                template="plotly_dark",
-                xaxis_title="Date",
-                yaxis_title="Revenue ($)",
-                showlegend=True,
-                width=800,
-                height=500
+            fig = await VisualizationService._in_thread(
+                VisualizationService._revenue_figure, revenue_data, width
             )
-            
-            return await VisualizationService._convert_fig_to_base64(fig)
+            return await VisualizationService._render_cached(cache_key, fig, image_format, width)
+        except RendererBusyError:
+            raise
         except Exception as e:
             print(f"Error creating revenue chart: {str(e)}")
             print(f"Traceback: {traceback.format_exc()}")
             return ""
 
     @staticmethod
-    async def _create_profitability_chart(company) -> str:
+    def _revenue_figure(revenue_data, width: int):
+        revenue_data = downsample_series(revenue_data, width)
+        
+        # Create figure
+        fig = px.line(
+            x=revenue_data.index,
+            y=revenue_data.values,
+            title="Revenue Growth Trend"
+        )
+        
+        fig.update_layout(
+            template="plotly_dark",
+            xaxis_title="Date",
+            yaxis_title="Revenue ($)",
+            showlegend=True,
+            width=width,
+            height=500
+        )
+        return fig
+
+    @staticmethod
+    async def _create_profitability_chart(snapshot: TickerSnapshot, image_format: str = "png",
+                                          width: int = DEFAULT_WIDTH) -> Any:
         """Create profitability metrics visualization"""
         try:
+            income_stmt = snapshot.income_stmt
+            
             # Check if income statement exists
-            if company.income_stmt is None or company.income_stmt.empty:
+            if income_stmt.empty:
                 print("No income statement data available")
                 return ""
             
-            # Find income columns
-            net_income_fields = ['Net Income', 'NetIncome', 'Net Income Common Stockholders']
-            operating_income_fields = ['Operating Income', 'OperatingIncome', 'EBIT']
-            
-            net_income = None
-            operating_income = None
-            
-            # Find net income
-            for field in net_income_fields:
-                if field in company.income_stmt.index:
-                    net_income = company.income_stmt.loc[field]
-                    break
-            
-            # Find operating income
-            for field in operating_income_fields:
-                if field in company.income_stmt.index:
-                    operating_income = company.income_stmt.loc[field]
-                    break
+            # Find income rows under any of their aliases
+            net_income = line_item(income_stmt, "net_income")
+            operating_income = line_item(income_stmt, "operating_income")
             
             # Check if both incomes are found
             if net_income is None or operating_income is None:
                 print("Could not find income data")
                 return ""
             
-            # Create figure
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=net_income.index,
-                y=net_income.values,
-                name="Net Income"
-            ))
-            fig.add_trace(go.Bar(
-                x=operating_income.index,
-                y=operating_income.values,
-                name="Operating Income"
-            ))
-            
-            fig.update_layout(
-                title="Profitability Metrics",
-                barmode='group',
-                template="plotly_dark",
-                yaxis_title="Amount ($)",
-                xaxis_title="Date",
-                width=800,
-                height=500
+            cache_key = chart_cache.fingerprint(
+                snapshot.ticker, "profitability", [net_income, operating_income],
+                VisualizationService._layout(image_format, width)
             )
+            cached = await chart_cache.get_async(cache_key)
+            if cached is not None:
+                return cached
             
-            return await VisualizationService._convert_fig_to_base64(fig)
+            fig = await VisualizationService._in_thread(
+                VisualizationService._profitability_figure, net_income, operating_income, width
+            )
+            return await VisualizationService._render_cached(cache_key, fig, image_format, width)
+        except RendererBusyError:
+            raise
         except Exception as e:
             print(f"Error creating profitability chart: {str(e)}")
             print(f"Traceback: {traceback.format_exc()}")
-            return ""
\ No newline at end of file
+            return ""
+
+    @staticmethod
+    def _profitability_figure(net_income, operating_income, width: int):
+        # Create figure
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=net_income.index,
+            y=net_income.values,
+            name="Net Income"
+        ))
+        fig.add_trace(go.Bar(
+            x=operating_income.index,
+            y=operating_income.values,
+            name="Operating Income"
+        ))
+        
+        fig.update_layout(
+            title="Profitability Metrics",
+            barmode='group',
+            template="plotly_dark",
+            yaxis_title="Amount ($)",
+            xaxis_title="Date",
+            width=width,
+            height=500
+        )
+        return fig
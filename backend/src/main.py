@@ -1,7 +1,35 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from src.Routers import viz, story, chat, article
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipMiddleware
+from Prompts.completion_cache import completion_cache
+from src.Routers import viz, story, chat, article, screen
+from src.Services.chart_renderer import ChartRenderer
+from src.Services.article_generator import article_jobs
 
-app = FastAPI(title='AIFinance', version='1.0.0')
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the chart renderer processes before the first /api/visualize request
+    ChartRenderer.start()
+    article_jobs.start()
+    yield
+    await article_jobs.shutdown()
+    ChartRenderer.shutdown()
+
+app = FastAPI(title='AIFinance', version='1.0.0', lifespan=lifespan)
+
+# Compress responses above a size threshold; analyses are markdown and shrink well.
+# Already-compressed bodies (PNG charts) and streams, which gzip would buffer, pass through as is.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))
+COMPRESSION_EXCLUDED_TYPES = tuple(dict.fromkeys(
+    DEFAULT_EXCLUDED_CONTENT_TYPES + ("image/png", "text/event-stream", "application/x-ndjson")
+))
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=COMPRESSION_MIN_SIZE,
+    exclude_content_types=COMPRESSION_EXCLUDED_TYPES,
+)
 
 # # Configure CORS
 # app.add_middleware(
@@ -15,8 +43,14 @@ app = FastAPI(title='AIFinance', version='1.0.0')
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/stats/cache", description='LLM completion cache hit/miss counters and size')
+async def cache_stats():
+    # stats() counts the SQLite rows; keep that off the event loop
+    return {"completions": await run_in_threadpool(completion_cache.stats)}
+
 # Include all routers
 app.include_router(chat.router, prefix="/api")
 app.include_router(story.router, prefix='/api')
 app.include_router(viz.router, prefix="/api")
 app.include_router(article.router, prefix="/api")
+app.include_router(screen.router, prefix="/api")
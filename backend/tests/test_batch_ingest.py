@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+
+from Data.batch_ingest import ingest_batch
+from Data.price_store import COMPANY_DATA_DIR, PriceStore
+from Data.providers import FixtureProvider
+from Data.web_extract import ingest_ticker
+
+
+def test_ingest_ticker_from_fixtures(tmp_path):
+    fixture_bars = pd.read_csv(os.path.join(COMPANY_DATA_DIR, "HDB", "stock_prices.csv"), index_col=0)
+    fixture_bars.index = pd.to_datetime(fixture_bars.index, utc=True)
+    end_date = fixture_bars.index.max().tz_localize(None).to_pydatetime() + pd.Timedelta(days=1)
+
+    ingest_ticker("HDB", end_date=end_date, provider=FixtureProvider(COMPANY_DATA_DIR),
+                  output_root=str(tmp_path))
+
+    output_dir = tmp_path / "HDB"
+    for file_name in ("balance_sheet.csv", "income_statement.csv", "cash_flow.csv", "company_info.csv"):
+        assert (output_dir / file_name).exists(), file_name
+
+    income = pd.read_csv(output_dir / "income_statement.csv", index_col=0)
+    assert "Total Revenue" in income.index
+    info = pd.read_csv(output_dir / "company_info.csv", index_col=0).iloc[:, 0]
+    assert info["symbol"] == "HDB"
+
+    store = PriceStore(str(tmp_path))
+    assert store.tickers() == ["HDB"]
+    bars = store.load("HDB")
+    window = fixture_bars[fixture_bars.index >= pd.Timestamp(end_date - pd.Timedelta(days=366), tz="UTC")]
+    assert len(bars) == len(window) > 0
+    assert bars["Close"].iloc[-1] == window["Close"].iloc[-1]
+
+
+def test_ingest_batch_from_fixtures(tmp_path):
+    report = ingest_batch(["HDB", "INFY", "MISSING"], provider=FixtureProvider(COMPANY_DATA_DIR),
+                          requests_per_second=0, output_root=str(tmp_path), retries=0)
+
+    assert report["succeeded"] == 2
+    assert [r["symbol"] for r in report["results"] if not r["ok"]] == ["MISSING"]
+    for symbol in ("HDB", "INFY"):
+        assert (tmp_path / symbol / "income_statement.csv").exists()
+        assert PriceStore(str(tmp_path)).has(symbol)